@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Comment, Follow, Group, Post
+from .models import (Comment, Follow, Group, OutboxCheckpoint, OutboxEvent,
+                     Post, Task)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -25,7 +26,27 @@ class FollowAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_after')
+    list_filter = ('status', 'name')
+    empty_value_display = '-пусто-'
+
+
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'topic', 'action', 'object_id', 'created')
+    list_filter = ('topic', 'action')
+    empty_value_display = '-пусто-'
+
+
+class OutboxCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('consumer', 'position', 'updated')
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Follow, FollowAdmin)
+admin.site.register(Task, TaskAdmin)
+admin.site.register(OutboxEvent, OutboxEventAdmin)
+admin.site.register(OutboxCheckpoint, OutboxCheckpointAdmin)
@@ -0,0 +1,119 @@
+"""Компактный JSON API лент только для чтения."""
+from functools import wraps
+
+from django.db.models import Count
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.vary import vary_on_cookie
+
+from yatube.routers import replica_reads
+from yatube.settings import COMMENTS_ON_PAGE
+
+from .comments import comments_page
+from .conditional import (conditional_feed, follow_feed, group_feed,
+                          index_feed, post_feed, profile_feed, user_salt)
+from .models import Group, Post, User
+from .pagination import make_paginator, no_count, page_size
+
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def json_response(payload, status=200):
+    return JsonResponse(payload, status=status, json_dumps_params=JSON_PARAMS)
+
+
+def api_login_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return json_response(
+                {'detail': 'Требуется авторизация'}, status=401
+            )
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def serialize_post(post):
+    return {
+        'id': post.id,
+        'author': post.author.username,
+        'group': post.group.slug if post.group else None,
+        'text': post.text,
+        'pub_date': post.pub_date.isoformat(),
+        'image': post.image.url if post.image else None,
+        'comments': post.comments_count,
+    }
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.id,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created': comment.created.isoformat(),
+    }
+
+
+def feed_response(request, posts):
+    posts = posts.select_related('author', 'group').annotate(
+        comments_count=Count('comments')
+    )
+    paginator = make_paginator(request, posts, page_size(request, 'api'))
+    page = paginator.get_page(request.GET.get('page'))
+    return json_response({
+        'count': paginator.count,
+        'page': page.number,
+        'num_pages': None if no_count(request) else paginator.num_pages,
+        'has_next': page.has_next(),
+        'results': [serialize_post(post) for post in page],
+    })
+
+
+@replica_reads
+@conditional_feed(index_feed)
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@replica_reads
+@conditional_feed(group_feed)
+def group_posts(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return feed_response(request, group.posts.all())
+
+
+@replica_reads
+@conditional_feed(profile_feed)
+def profile(request, username):
+    author = get_object_or_404(User, username=username)
+    return feed_response(request, author.posts.all())
+
+
+@replica_reads
+@conditional_feed(post_feed)
+def post_view(request, username, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group').annotate(
+            comments_count=Count('comments')
+        ),
+        author__username=username,
+        id=post_id,
+    )
+    comments, next_cursor = comments_page(
+        post, request.GET.get('cursor'), COMMENTS_ON_PAGE
+    )
+    return json_response({
+        'post': serialize_post(post),
+        'comments': [serialize_comment(comment) for comment in comments],
+        'next_cursor': next_cursor,
+    })
+
+
+@replica_reads
+@vary_on_cookie
+@api_login_required
+@conditional_feed(follow_feed, salt=user_salt)
+def follow_index(request):
+    return feed_response(
+        request, Post.objects.filter(author__following__user=request.user)
+    )
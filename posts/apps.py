@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+
+        from . import (cdn, fingerprints, groups, images,  # noqa: F401
+                       signals, trending)
+        from .links import user_url
+
+        # Адрес профиля для user.get_absolute_url в шаблонах.
+        get_user_model().get_absolute_url = user_url
@@ -0,0 +1,127 @@
+"""Заголовки для кэширования на CDN и очистка кэша по surrogate-ключам.
+
+Анонимные ответы лент получают ``Cache-Control: public, s-maxage`` и
+``Surrogate-Key`` со списком ключей вида ``post-<id>``, ``author-<id>``,
+``group-<slug>``. Ключи постов, комментариев и подписок потребитель
+журнала ``cdn`` передаёт очистителю из настройки ``CDN_PURGER`` пакетом,
+одним запросом к CDN на много записей. Редкие записи вне журнала —
+группы и пользователи — ставят очистку в очередь фоновых задач.
+"""
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.module_loading import import_string
+
+from .models import Group
+from .outbox import consumer
+from .queue import enqueue, task
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = 'index'
+
+
+def post_key(post_id):
+    return f'post-{post_id}'
+
+
+def author_key(author_id):
+    return f'author-{author_id}'
+
+
+def group_key(slug):
+    return f'group-{slug}'
+
+
+def post_keys(post):
+    keys = [post_key(post.id), author_key(post.author_id)]
+    if post.group_id:
+        keys.append(group_key(post.group.slug))
+    return keys
+
+
+def page_keys(posts):
+    keys = []
+    for post in posts:
+        keys.extend((post_key(post.id), author_key(post.author_id)))
+    return keys
+
+
+def add_surrogate_keys(response, keys):
+    existing = response.get('Surrogate-Key', '').split()
+    merged = dict.fromkeys(existing + list(keys))
+    response['Surrogate-Key'] = ' '.join(merged)
+    return response
+
+
+def edge_cacheable(view):
+    """Разрешает CDN кэшировать ответы анонимным пользователям."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD'):
+            return response
+        patch_vary_headers(response, ('Cookie',))
+        if (request.user.is_authenticated
+                or response.status_code not in (200, 304)):
+            patch_cache_control(response, private=True)
+            if response.has_header('Surrogate-Key'):
+                del response['Surrogate-Key']
+        else:
+            patch_cache_control(
+                response, public=True, s_maxage=settings.CDN_CACHE_SECONDS
+            )
+        return response
+    return wrapper
+
+
+class NullPurger:
+    def purge(self, keys):
+        logger.debug('CDN purge: %s', ' '.join(keys))
+
+
+class LocalPurger:
+    """Запоминает очищенные ключи вместо запроса к CDN."""
+
+    purged = []
+
+    def purge(self, keys):
+        self.purged.extend(keys)
+
+
+def purge_now(keys):
+    import_string(settings.CDN_PURGER)().purge(list(dict.fromkeys(keys)))
+
+
+@task('cdn_purge', batch=True)
+def purge_batch(payloads):
+    purge_now([key for payload in payloads for key in payload['keys']])
+
+
+def event_keys(event, group_ids):
+    data = event.data
+    if event.topic == 'comment':
+        return [post_key(data['post_id'])]
+    if event.topic == 'follow':
+        return [author_key(data['author_id'])]
+    group_ids.update((data['group_id'], data.get('old_group_id')))
+    return [INDEX_KEY, post_key(event.object_id),
+            author_key(data['author_id'])]
+
+
+@consumer('cdn')
+def purge_changed(events):
+    group_ids = set()
+    keys = [key for event in events for key in event_keys(event, group_ids)]
+    keys.extend(group_key(slug) for slug in Group.objects.filter(
+        id__in=group_ids - {None}
+    ).values_list('slug', flat=True))
+    if keys:
+        purge_now(keys)
+
+
+def purge(keys):
+    """Ставит очистку ключей в очередь вместе с текущей записью."""
+    enqueue('cdn_purge', {'keys': list(dict.fromkeys(keys))})
@@ -0,0 +1,42 @@
+"""Постраничная выдача комментариев по курсору (created, id)."""
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_cursor(comment):
+    return f'{(comment.created - EPOCH) // MICROSECOND}_{comment.id}'
+
+
+def decode_cursor(cursor):
+    try:
+        created, pk = cursor.split('_')
+        return EPOCH + int(created) * MICROSECOND, int(pk)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def comments_page(post, cursor, per_page):
+    """Возвращает страницу комментариев и курсор следующей страницы."""
+    comments = post.comments.select_related('author').order_by(
+        '-created', '-id'
+    )
+    position = decode_cursor(cursor)
+    if position is not None:
+        created, pk = position
+        comments = comments.filter(
+            Q(created__lt=created) | Q(created=created, id__lt=pk)
+        )
+    page = comments[:per_page]
+    next_cursor = None
+    if len(page) == per_page:
+        last = page[per_page - 1]
+        if comments.filter(
+            Q(created__lt=last.created) | Q(created=last.created,
+                                            id__lt=last.id)
+        ).exists():
+            next_cursor = encode_cursor(last)
+    return page, next_cursor
@@ -0,0 +1,162 @@
+"""Валидаторы для условных GET-запросов к лентам и страницам.
+
+Страница зависит от нескольких областей данных, названных так же, как
+surrogate-ключи CDN: ``index``, ``group-<slug>``, ``author-<id>``,
+``post-<id>``, и ещё ``follower-<id>`` — подписки пользователя. Для
+каждой области в общем кэше хранится версия — время её последнего
+изменения, которое сдвигают сигналы при записи. Состояние страницы —
+версии её областей: валидатор стоит одного чтения кэша (для страниц
+автора — ещё поиска id по уникальному имени), а не агрегатов по постам и
+комментариям, и неизменившаяся страница отдаёт 304 без рендеринга.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.views.decorators.http import condition
+
+from .cdn import INDEX_KEY, author_key, group_key, post_key
+from .follows import following_ids
+from .models import User
+
+VERSION_KEY = 'feed_version:{}'
+
+
+def follower_key(user_id):
+    return f'follower-{user_id}'
+
+
+def version_cache():
+    return caches[settings.FEED_VERSION_CACHE_ALIAS]
+
+
+def feed_versions(keys):
+    """Версии областей ``keys``; у неизвестной области — текущее время."""
+    versions_cache = version_cache()
+    cache_keys = [VERSION_KEY.format(key) for key in keys]
+    versions = versions_cache.get_many(cache_keys)
+    missing = [key for key in cache_keys if key not in versions]
+    if missing:
+        now = time.time()
+        for key in missing:
+            versions_cache.add(key, now, settings.FEED_VERSION_TIMEOUT)
+        versions.update(versions_cache.get_many(missing))
+    return [versions.get(key, time.time()) for key in cache_keys]
+
+
+def touch_feeds(keys):
+    """Сдвигает версии областей сразу и ещё раз после коммита: иначе
+    параллельный запрос отдал бы новую версию с ещё старыми данными.
+    """
+    def touch():
+        now = time.time()
+        version_cache().set_many(
+            {VERSION_KEY.format(key): now for key in keys},
+            settings.FEED_VERSION_TIMEOUT,
+        )
+
+    touch()
+    transaction.on_commit(touch)
+
+
+def author_id(username):
+    return User.objects.filter(username=username).values_list(
+        'id', flat=True
+    ).first()
+
+
+def index_feed(request):
+    return [INDEX_KEY]
+
+
+def group_feed(request, slug):
+    return [group_key(slug)]
+
+
+def profile_feed(request, username):
+    return [author_key(author_id(username))]
+
+
+def post_feed(request, username, post_id):
+    return [post_key(post_id)]
+
+
+def follow_feed(request):
+    return [follower_key(request.user.pk)] + [
+        author_key(following) for following in sorted(following_ids(request))
+    ]
+
+
+def card_follows(request):
+    """Подписки пользователя, влияющие на карточку профиля."""
+    if request.user.is_authenticated:
+        return [follower_key(request.user.pk)]
+    return []
+
+
+def profile_page(request, username):
+    return profile_feed(request, username) + card_follows(request)
+
+
+def post_page(request, username, post_id):
+    return [post_key(post_id), author_key(author_id(username))] + (
+        card_follows(request)
+    )
+
+
+def user_salt(request):
+    return str(request.user.pk)
+
+
+class FeedState:
+    def __init__(self, keys):
+        self.values = feed_versions(keys)
+        self.last_modified = datetime.fromtimestamp(
+            max(self.values), timezone.utc
+        ) if self.values else None
+
+    def etag(self, salt=''):
+        raw = ':'.join(str(value) for value in [salt] + self.values)
+        return '"{}"'.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def conditional_feed(feed, salt=None, cache_timeout=None):
+    """Отвечает 304, если состояние ленты совпадает с кэшем клиента.
+
+    ``feed`` возвращает области данных страницы, ``salt`` — строку,
+    отличающую ответы разным пользователям на один URL; такие ответы
+    получают только ETag, потому что Last-Modified не различает
+    пользователей. ``cache_timeout`` нужен
+    страницам, тело которых само кэшируется: состояние живёт в кэше
+    столько же, сколько фрагмент, и ETag не опережает устаревшее тело.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            def get_state():
+                return FeedState(feed(request, *args, **kwargs))
+
+            if cache_timeout is None:
+                state = get_state()
+            else:
+                state = cache.get_or_set(
+                    f'feed_state:{request.get_full_path()}',
+                    get_state,
+                    cache_timeout,
+                )
+            if salt is None:
+                etag = state.etag()
+                last_modified = state.last_modified
+            else:
+                etag = state.etag(salt(request))
+                last_modified = None
+            return condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: last_modified,
+            )(view)(request, *args, **kwargs)
+        return wrapper
+    return decorator
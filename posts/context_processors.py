@@ -1,6 +1,15 @@
 from datetime import datetime as dt
 
+from django.utils.functional import SimpleLazyObject
+
+from .follows import following_ids
+
 
 def get_year_footer(request):
     year = dt.now().strftime('%Y')
     return {'year': year}
+
+
+def following(request):
+    """Ленивое множество id авторов, на которых подписан пользователь."""
+    return {'following': SimpleLazyObject(lambda: following_ids(request))}
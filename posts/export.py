@@ -0,0 +1,79 @@
+"""Потоковая выгрузка постов и комментариев в JSONL и CSV."""
+import csv
+import json
+from itertools import chain
+
+from .models import Comment, Post
+
+EXPORT_CHUNK_SIZE = 500
+EXPORT_FIELDS = ['type', 'id', 'post', 'author', 'group', 'text', 'date',
+                 'image']
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def post_rows(posts):
+    posts = posts.values_list(
+        'id', 'author__username', 'group__slug', 'text', 'pub_date', 'image'
+    )
+    for pk, author, group, text, pub_date, image in posts.iterator(
+            chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            'type': 'post', 'id': pk, 'post': None, 'author': author,
+            'group': group, 'text': text, 'date': pub_date.isoformat(),
+            'image': image or None,
+        }
+
+
+def comment_rows(comments):
+    comments = comments.values_list(
+        'id', 'post_id', 'author__username', 'text', 'created'
+    )
+    for pk, post, author, text, created in comments.iterator(
+            chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            'type': 'comment', 'id': pk, 'post': post, 'author': author,
+            'group': None, 'text': text, 'date': created.isoformat(),
+            'image': None,
+        }
+
+
+def user_rows(user):
+    return chain(
+        post_rows(Post.objects.filter(author=user).order_by('id')),
+        comment_rows(Comment.objects.filter(author=user).order_by('id')),
+    )
+
+
+def group_rows(group):
+    return chain(
+        post_rows(group.posts.order_by('id')),
+        comment_rows(Comment.objects.filter(post__group=group).order_by('id')),
+    )
+
+
+def render_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writerow(dict(zip(EXPORT_FIELDS, EXPORT_FIELDS)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+RENDERERS = {
+    'jsonl': render_jsonl,
+    'csv': render_csv,
+}
@@ -0,0 +1,134 @@
+"""Поиск почти одинаковых текстов постов и комментариев по SimHash.
+
+Отпечаток — 64-битный SimHash шинглов из трёх слов нормализованного
+текста; у похожих текстов отпечатки отличаются в немногих битах.
+Отпечаток делится на четыре 16-битные полосы с индексом на каждой: если
+расстояние Хэмминга не больше трёх, хотя бы одна полоса совпадает
+целиком, поэтому кандидатов находит индексный поиск, а не просмотр
+таблицы. Отпечатки сохранённых и удалённых текстов обновляет
+потребитель журнала ``fingerprints``.
+"""
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Comment, Fingerprint, Post
+from .outbox import consumer
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+SHINGLE = 3
+
+WORD = re.compile(r'\w+')
+
+
+def shingles(text):
+    words = WORD.findall(text.lower())
+    if len(words) < SHINGLE:
+        return [' '.join(words)]
+    return [
+        ' '.join(words[start:start + SHINGLE])
+        for start in range(len(words) - SHINGLE + 1)
+    ]
+
+
+def simhash(text):
+    weights = [0] * BITS
+    for shingle in shingles(text):
+        value = int.from_bytes(
+            hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big'
+        )
+        for bit in range(BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+
+
+def bands(value):
+    mask = (1 << BAND_BITS) - 1
+    return [value >> (band * BAND_BITS) & mask for band in range(BANDS)]
+
+
+def to_signed(value):
+    """64-битный отпечаток в диапазоне BigIntegerField."""
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def to_unsigned(value):
+    return value % (1 << BITS)
+
+
+def checked(text):
+    return len(text.strip()) >= settings.DUPLICATE_MIN_LENGTH
+
+
+def find_duplicate(kind, text, exclude=None):
+    """Отпечаток похожего недавнего текста того же типа или ``None``."""
+    if not checked(text):
+        return None
+    value = simhash(text)
+    matches = Q()
+    for band, band_value in enumerate(bands(value)):
+        matches |= Q(**{f'band_{band}': band_value})
+    candidates = Fingerprint.objects.filter(
+        matches,
+        kind=kind,
+        created__gte=timezone.now() - timedelta(
+            seconds=settings.DUPLICATE_WINDOW_SECONDS
+        ),
+    )
+    if exclude is not None:
+        candidates = candidates.exclude(object_id=exclude)
+    for candidate in candidates:
+        distance = bin(to_unsigned(candidate.simhash) ^ value).count('1')
+        if distance <= settings.DUPLICATE_MAX_DISTANCE:
+            return candidate
+    return None
+
+
+def fingerprint_fields(text):
+    value = simhash(text)
+    fields = {
+        f'band_{band}': band_value
+        for band, band_value in enumerate(bands(value))
+    }
+    fields['simhash'] = to_signed(value)
+    return fields
+
+
+def remember_many(kind, objects, using=None):
+    """Пакетный ``remember`` для объектов, сохранённых без сигналов."""
+    fingerprints = Fingerprint.objects.using(using)
+    fingerprints.filter(
+        kind=kind, object_id__in=[obj.pk for obj in objects]
+    ).delete()
+    fingerprints.bulk_create(
+        Fingerprint(kind=kind, object_id=obj.pk,
+                    **fingerprint_fields(str(obj.text)))
+        for obj in objects if checked(str(obj.text))
+    )
+
+
+MODELS = {Fingerprint.POST: Post, Fingerprint.COMMENT: Comment}
+
+
+@consumer('fingerprints')
+def update_fingerprints(events):
+    """Пересчитывает отпечатки объектов из пакета событий.
+
+    Важно только итоговое состояние: существующий объект получает
+    отпечаток своего текста, удалённый теряет отпечаток.
+    """
+    for kind, model in MODELS.items():
+        ids = {event.object_id for event in events if event.topic == kind}
+        if not ids:
+            continue
+        objects = list(model.objects.filter(pk__in=ids).only('id', 'text'))
+        remember_many(kind, objects)
+        Fingerprint.objects.filter(kind=kind, object_id__in=ids - {
+            obj.pk for obj in objects
+        }).delete()
@@ -0,0 +1,58 @@
+"""Множество авторов, на которых подписан пользователь.
+
+Множество читается из базы одним запросом и хранится в общем для
+процессов кэше ``FOLLOWING_CACHE_ALIAS`` под ключом пользователя, а в
+пределах запроса запоминается на самом запросе, поэтому любое число
+проверок подписки на странице стоит не больше одного обращения.
+Сигналы на ``Follow`` сбрасывают кэш при подписке и отписке сразу во
+всех процессах.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Follow
+
+FOLLOWING_CACHE_KEY = 'following:{}'
+REQUEST_ATTR = '_following_ids'
+
+
+def following_cache_key(user_id):
+    return FOLLOWING_CACHE_KEY.format(user_id)
+
+
+def following_cache():
+    return caches[settings.FOLLOWING_CACHE_ALIAS]
+
+
+def load_following(user_id):
+    key = following_cache_key(user_id)
+    cache = following_cache()
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(Follow.objects.filter(
+            user_id=user_id
+        ).values_list('author_id', flat=True))
+        cache.set(key, ids, settings.FOLLOWING_CACHE_TIMEOUT)
+    return ids
+
+
+def following_ids(request):
+    """id авторов, на которых подписан пользователь запроса."""
+    if not request.user.is_authenticated:
+        return frozenset()
+    ids = getattr(request, REQUEST_ATTR, None)
+    if ids is None:
+        ids = load_following(request.user.pk)
+        setattr(request, REQUEST_ATTR, ids)
+    return ids
+
+
+def forget_following(user_id):
+    """Сбрасывает кэш сразу и ещё раз после коммита: иначе параллельный
+    запрос успел бы закэшировать множество без незакоммиченной подписки.
+    """
+    key = following_cache_key(user_id)
+    cache = following_cache()
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
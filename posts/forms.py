@@ -1,6 +1,9 @@
 from django import forms
 
-from .models import Comment, Post
+from .fingerprints import find_duplicate
+from .models import Comment, Fingerprint, Post
+
+DUPLICATE_MESSAGE = 'Похожий текст уже опубликован.'
 
 
 class PostForm(forms.ModelForm):
@@ -8,8 +11,20 @@ class PostForm(forms.ModelForm):
         model = Post
         fields = ['group', 'text', 'image']
 
+    def clean_text(self):
+        text = self.cleaned_data['text']
+        if find_duplicate(Fingerprint.POST, text, exclude=self.instance.pk):
+            raise forms.ValidationError(DUPLICATE_MESSAGE)
+        return text
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ['text']
+
+    def clean_text(self):
+        text = self.cleaned_data['text']
+        if find_duplicate(Fingerprint.COMMENT, text):
+            raise forms.ValidationError(DUPLICATE_MESSAGE)
+        return text
@@ -0,0 +1,165 @@
+"""Сводки групп для каталога и готовая первая страница каждой группы.
+
+``GroupSummary`` хранит число постов, время последней активности и id
+постов первой страницы группы. Потребитель журнала ``group_summaries``
+сдвигает счётчик через F() при появлении, переносе и удалении поста, не
+пересчитывая COUNT, поэтому каталог читается одним запросом, а первая
+страница группы — выборкой постов по готовому списку id без COUNT и
+OFFSET. Пока потребитель не догнал журнал, ``first_page`` замечает
+отставание сводки по самому новому посту группы и отдаёт страницу
+обычной пагинации. Полный пересчёт — ``refresh_summary`` и
+``rebuild_summaries``.
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import Page
+from django.db.models import Count, F, Max, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Comment, Group, GroupSummary, OutboxEvent, Post
+from .outbox import consumer
+from .templatetags.post_cards import card_posts
+
+
+def page_size():
+    return settings.FEED_PAGE_SIZES['group']
+
+
+def first_page_ids(group_id, using='default'):
+    return list(Post.objects.using(using).filter(
+        group_id=group_id
+    ).values_list('id', flat=True)[:page_size()])
+
+
+def summary_fields(group_id, using='default'):
+    posts = Post.objects.using(using).filter(group_id=group_id)
+    state = posts.aggregate(count=Count('id'), last=Max('pub_date'))
+    last_comment = Comment.objects.using(using).filter(
+        post__group_id=group_id
+    ).aggregate(last=Max('created'))['last']
+    return {
+        'posts_count': state['count'],
+        'last_activity': max(
+            filter(None, [state['last'], last_comment]), default=None
+        ),
+        'first_page': json.dumps(first_page_ids(group_id, using)),
+    }
+
+
+def refresh_summary(group_id):
+    """Пересчитывает сводку группы ``group_id``."""
+    GroupSummary.objects.update_or_create(
+        group_id=group_id, defaults=summary_fields(group_id)
+    )
+
+
+def touch_summary(group_id, moment):
+    """Сдвигает время последней активности группы вперёд."""
+    GroupSummary.objects.filter(group_id=group_id).filter(
+        Q(last_activity__lt=moment) | Q(last_activity__isnull=True)
+    ).update(last_activity=moment)
+
+
+def save_first_page(summary, ids):
+    summary.first_page = json.dumps(ids)
+    summary.save(update_fields=['first_page', 'updated'])
+
+
+def add_post(group_id, post_id, pub_date, newest=False):
+    """Учитывает пост в сводке группы; ``newest`` — пост новее всех."""
+    if group_id is None:
+        return
+    summary = GroupSummary.objects.filter(group_id=group_id).first()
+    if summary is None:
+        refresh_summary(group_id)
+        return
+    GroupSummary.objects.filter(group_id=group_id).update(
+        posts_count=F('posts_count') + 1
+    )
+    if pub_date is not None:
+        touch_summary(group_id, pub_date)
+    ids = json.loads(summary.first_page)
+    if newest and len(ids) == min(summary.posts_count, page_size()):
+        save_first_page(summary, [post_id] + ids[:page_size() - 1])
+    else:
+        save_first_page(summary, first_page_ids(group_id))
+
+
+def remove_post(group_id, post_id):
+    """Убирает пост из сводки группы."""
+    if group_id is None:
+        return
+    GroupSummary.objects.filter(
+        group_id=group_id, posts_count__gt=0
+    ).update(posts_count=F('posts_count') - 1)
+    summary = GroupSummary.objects.filter(group_id=group_id).first()
+    if summary is not None and post_id in json.loads(summary.first_page):
+        save_first_page(summary, first_page_ids(group_id))
+
+
+def apply_post_event(event):
+    data = event.data
+    pub_date = parse_datetime(data.get('pub_date') or '')
+    if event.action == OutboxEvent.CREATED:
+        add_post(data['group_id'], event.object_id, pub_date, newest=True)
+    elif event.action == OutboxEvent.DELETED:
+        remove_post(data['group_id'], event.object_id)
+    elif 'old_group_id' in data:
+        remove_post(data['old_group_id'], event.object_id)
+        add_post(data['group_id'], event.object_id, pub_date)
+
+
+@consumer('group_summaries')
+def update_summaries(events):
+    comments = [
+        event for event in events
+        if event.topic == 'comment' and event.action == OutboxEvent.CREATED
+    ]
+    post_groups = dict(Post.objects.filter(
+        id__in={event.data['post_id'] for event in comments}
+    ).values_list('id', 'group_id'))
+    for event in events:
+        if event.topic == 'post':
+            apply_post_event(event)
+    for event in comments:
+        group_id = post_groups.get(event.data['post_id'])
+        created = parse_datetime(event.data.get('created') or '')
+        if group_id is not None and created is not None:
+            touch_summary(group_id, created)
+
+
+def rebuild_summaries(using='default'):
+    """Пересчитывает сводки всех групп, например после загрузки данных."""
+    summaries = [
+        GroupSummary(group_id=group_id, **summary_fields(group_id, using))
+        for group_id in Group.objects.using(using).values_list(
+            'id', flat=True
+        )
+    ]
+    GroupSummary.objects.using(using).all().delete()
+    GroupSummary.objects.using(using).bulk_create(summaries)
+    return len(summaries)
+
+
+def first_page(group, paginator):
+    """Первая страница группы по сводке или ``None``, если сводки нет."""
+    summary = getattr(group, 'summary', None)
+    if summary is None:
+        return None
+    ids = json.loads(summary.first_page)
+    if len(ids) != min(summary.posts_count, paginator.per_page):
+        # Сводка собрана для другого размера страницы.
+        return None
+    newest = Post.objects.filter(group_id=group.pk).order_by(
+        '-id'
+    ).values_list('id', flat=True).first()
+    if newest is not None and newest not in ids:
+        # Потребитель ещё не учёл новый пост.
+        return None
+    posts = card_posts(Post.objects.all()).in_bulk(ids)
+    if len(posts) != len(ids):
+        # Пост с первой страницы удалён, а сводка ещё не обновлена.
+        return None
+    paginator.count = summary.posts_count
+    return Page([posts[post_id] for post_id in ids], 1, paginator)
@@ -0,0 +1,72 @@
+import base64
+from io import BytesIO
+
+from PIL import Image, ImageOps
+from sorl.thumbnail import get_thumbnail
+
+from .models import OutboxEvent, Post
+from .outbox import consumer
+from .queue import enqueue, task
+
+FEED_THUMBNAIL = '960x580'
+FEED_THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+PLACEHOLDER_SIZE = (24, 15)
+
+
+@task('warm_thumbnail')
+def warm_thumbnail(post_id):
+    """Заранее создаёт миниатюру ленты, чтобы её не ждал первый читатель."""
+    post = Post.objects.filter(id=post_id).first()
+    if post is not None and post.image:
+        get_thumbnail(post.image, FEED_THUMBNAIL, **FEED_THUMBNAIL_OPTIONS)
+
+
+def enqueue_thumbnail(post):
+    if post.image:
+        enqueue('warm_thumbnail', {'post_id': post.id},
+                key=f'thumbnail:{post.id}:{post.image.name}')
+
+
+@consumer('thumbnails')
+def enqueue_thumbnails(events):
+    """Ставит прогрев миниатюр сохранённых постов в очередь задач."""
+    ids = {
+        event.object_id for event in events
+        if event.topic == 'post' and event.action != OutboxEvent.DELETED
+    }
+    for post in Post.objects.filter(id__in=ids).exclude(image='').exclude(
+            image=None).only('id', 'image'):
+        enqueue_thumbnail(post)
+
+
+def image_preview(image):
+    """Основной цвет и крошечная JPEG-заглушка в пропорциях ленты.
+
+    Заглушка весит несколько сотен байт и встраивается в страницу как
+    data URI, пока браузер лениво грузит саму миниатюру.
+    """
+    position = image.tell() if hasattr(image, 'tell') else 0
+    try:
+        with Image.open(image) as source:
+            source.draft('RGB', (PLACEHOLDER_SIZE[0] * 4,
+                                 PLACEHOLDER_SIZE[1] * 4))
+            picture = ImageOps.fit(source.convert('RGB'), PLACEHOLDER_SIZE)
+    finally:
+        image.seek(position)
+    red, green, blue = picture.resize((1, 1), Image.BOX).getpixel((0, 0))
+    buffer = BytesIO()
+    picture.save(buffer, 'JPEG', quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return (f'#{red:02x}{green:02x}{blue:02x}',
+            f'data:image/jpeg;base64,{encoded}')
+
+
+def set_image_preview(post):
+    """Заполняет цвет и заглушку поста по его изображению."""
+    if not post.image:
+        post.image_color = post.image_placeholder = ''
+        return
+    try:
+        post.image_color, post.image_placeholder = image_preview(post.image)
+    except (OSError, ValueError):
+        post.image_color = post.image_placeholder = ''
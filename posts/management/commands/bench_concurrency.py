@@ -0,0 +1,101 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from yatube.asgi import application as asgi_application
+from yatube.wsgi import application as wsgi_application
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность настоящих представлений '
+            'через WSGI-приложение и через ASGI-обёртку при одинаковом '
+            'числе одновременных клиентов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append',
+                            help='Адрес страницы, можно указать несколько '
+                                 'раз; по умолчанию главная.')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--clients', type=int, default=8,
+                            help='Одновременных клиентов в обоих режимах.')
+
+    def handle(self, *args, **options):
+        # Медленные клиенты здесь не моделируются: их держит сервер
+        # (gunicorn, uvicorn), а не приложение, и сравнивать это нужно
+        # нагрузочным тестом настоящего сервера.
+        self.paths = options['path'] or ['/']
+        total = options['requests']
+        clients = options['clients']
+        for title, run in (('WSGI', self.run_wsgi), ('ASGI', self.run_asgi)):
+            start = time.perf_counter()
+            results = run(total, clients)
+            elapsed = time.perf_counter() - start
+            latencies = sorted(latency for latency, _ in results)
+            self.stdout.write(
+                f'{title}, {clients} клиентов: {total} запросов за '
+                f'{elapsed:.2f} с ({total / elapsed:.0f} запросов/с, '
+                f'медиана {statistics.median(latencies) * 1000:.1f} мс, '
+                f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f} мс, '
+                f'{sum(size for _, size in results) // total} байт на ответ)'
+            )
+
+    def path(self, number):
+        return self.paths[number % len(self.paths)]
+
+    def run_wsgi(self, total, clients):
+        factory = RequestFactory()
+
+        def serve(number):
+            started = time.perf_counter()
+            environ = factory.get(self.path(number)).environ
+            body = b''.join(wsgi_application(environ, lambda *args: None))
+            return time.perf_counter() - started, len(body)
+
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            return list(pool.map(serve, range(total)))
+
+    def run_asgi(self, total, clients):
+        async def serve(semaphore, number):
+            async with semaphore:
+                started = time.perf_counter()
+                body = []
+
+                async def receive():
+                    return {'type': 'http.request', 'body': b''}
+
+                async def send(message):
+                    if message['type'] == 'http.response.body':
+                        body.append(message.get('body', b''))
+
+                await asgi_application(
+                    self.scope(self.path(number)), receive, send
+                )
+                return time.perf_counter() - started, len(b''.join(body))
+
+        async def main():
+            semaphore = asyncio.Semaphore(clients)
+            return await asyncio.gather(
+                *(serve(semaphore, number) for number in range(total))
+            )
+
+        return asyncio.run(main())
+
+    def scope(self, full_path):
+        path, _, query = full_path.partition('?')
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'root_path': '',
+            'query_string': query.encode(),
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 0),
+        }
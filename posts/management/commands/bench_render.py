@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import Context, Template
+from django.template.loader import get_template
+
+from posts.models import Group, Post, User
+
+CARD = 'auxiliary/post_card.html'
+
+REVERSED_LINKS = {
+    '{{ post.author.get_absolute_url }}':
+        "{% url 'profile' post.author.username %}",
+    '{{ post.group.get_absolute_url }}': "{% url 'group' post.group.slug %}",
+    '{{ post.get_absolute_url }}':
+        "{% url 'post' post.author.username post.id %}",
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время рендеринга страницы карточек постов со '
+            'ссылками через {% url %} и через get_absolute_url.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=50)
+        parser.add_argument('--rounds', type=int, default=20)
+
+    def handle(self, *args, **options):
+        source = get_template(CARD).template.source
+        reversing = source
+        for helper, tag in REVERSED_LINKS.items():
+            reversing = reversing.replace(helper, tag)
+        templates = (
+            ('{% url %}', Template(reversing)),
+            ('get_absolute_url', Template(source)),
+        )
+        with transaction.atomic():
+            posts = self.create_posts(options['posts'])
+            timings = [
+                (title, self.render(template, posts, options['rounds']))
+                for title, template in templates
+            ]
+            transaction.set_rollback(True)
+        for title, elapsed in timings:
+            self.stdout.write(
+                f'{title}: {elapsed * 1000:.2f} мс на страницу из '
+                f'{len(posts)} постов'
+            )
+        baseline, helpers = (elapsed for _, elapsed in timings)
+        self.stdout.write(self.style.SUCCESS(
+            f'Экономия: {(1 - helpers / baseline) * 100:.0f}%'
+        ))
+
+    def create_posts(self, count):
+        author = User.objects.create(username='bench_render_author')
+        group = Group.objects.create(title='Бенчмарк', slug='bench-render',
+                                     description='Бенчмарк')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}\nвторая строка', author=author,
+                 group=group)
+            for number in range(count)
+        )
+        return list(Post.objects.filter(author=author).select_related(
+            'author', 'group'
+        ).prefetch_related('comments'))
+
+    def render(self, template, posts, rounds):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for post in posts:
+                template.render(Context({'post': post}))
+        return (time.perf_counter() - started) / rounds
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.db.utils import load_backend
+
+STOCK_ENGINE = 'django.db.backends.sqlite3'
+TUNED_ENGINE = 'yatube.db'
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность записи в SQLite '
+            'из нескольких потоков через соединения Django со стандартным '
+            'бэкендом и с бэкендом, применяющим SQLITE_PRAGMAS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--rows', type=int, default=200,
+                            help='Количество вставок на поток.')
+
+    def handle(self, *args, **options):
+        # Оба варианта открывают соединения одинаково, с таймаутом
+        # sqlite3 по умолчанию, и различаются только PRAGMA бэкенда.
+        for title, engine in (
+            ('стандартный бэкенд', STOCK_ENGINE),
+            ('SQLITE_PRAGMAS', TUNED_ENGINE),
+        ):
+            written, errors, elapsed = self.run(
+                engine, options['threads'], options['rows'])
+            self.stdout.write(
+                f'{title}: {written} строк за {elapsed:.2f} с '
+                f'({written / elapsed:.0f} строк/с), '
+                f'ошибок блокировки: {errors}'
+            )
+        self.stdout.write(
+            f'PRAGMA: {settings.SQLITE_PRAGMAS}'
+        )
+
+    def connect(self, engine, path):
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict.update(ENGINE=engine, NAME=path, TEST={})
+        return load_backend(engine).DatabaseWrapper(settings_dict)
+
+    def run(self, engine, threads, rows):
+        fd, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        try:
+            connection = self.connect(engine, path)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'CREATE TABLE comment (id INTEGER PRIMARY KEY, text TEXT)')
+            connection.close()
+
+            written = []
+            errors = []
+
+            def writer():
+                connection = self.connect(engine, path)
+                with connection.cursor() as cursor:
+                    for number in range(rows):
+                        try:
+                            cursor.execute(
+                                'INSERT INTO comment (text) VALUES (%s)',
+                                [f'Комментарий {number}']
+                            )
+                            written.append(1)
+                        except OperationalError:
+                            errors.append(1)
+                connection.close()
+
+            workers = [threading.Thread(target=writer) for _ in range(threads)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            return len(written), len(errors), time.perf_counter() - start
+        finally:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
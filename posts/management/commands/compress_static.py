@@ -0,0 +1,31 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from yatube.compression import COMPRESSIBLE, precompress
+
+
+class Command(BaseCommand):
+    help = ('Сжимает статику в STATIC_ROOT заранее: рядом с файлом '
+            'появляются .gz и, если установлен brotli, .br.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', default=settings.STATIC_ROOT)
+        parser.add_argument('--force', action='store_true',
+                            help='Пересжать даже неизменившиеся файлы.')
+
+    def handle(self, *args, **options):
+        original = compressed = 0
+        for directory, _, names in os.walk(options['root']):
+            for name in names:
+                if not name.endswith(COMPRESSIBLE):
+                    continue
+                sizes = precompress(os.path.join(directory, name),
+                                    options['force'])
+                if sizes:
+                    original += sizes[0]
+                    compressed += sizes[1]
+        self.stdout.write(self.style.SUCCESS(
+            f'Сжато {original} байт в {compressed} байт.'
+        ))
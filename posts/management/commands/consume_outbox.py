@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.outbox import CONSUMERS, consume, replay
+
+
+class Command(BaseCommand):
+    help = ('Доставляет события журнала изменений зарегистрированным '
+            'потребителям.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('consumers', nargs='*',
+                            help='По умолчанию — все потребители.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--replay-from', type=int,
+                            help='Повторно доставить события начиная с id.')
+        parser.add_argument('--sleep', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true',
+                            help='Доставить накопленные события и выйти.')
+
+    def handle(self, *args, **options):
+        names = options['consumers'] or list(CONSUMERS)
+        unknown = set(names) - set(CONSUMERS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные потребители: {", ".join(sorted(unknown))}'
+            )
+        if options['replay_from'] is not None:
+            for name in names:
+                replay(name, max(options['replay_from'] - 1, 0))
+        while True:
+            delivered = 0
+            for name in names:
+                count = consume(name, options['batch_size'])
+                if count and options['verbosity'] > 1:
+                    self.stdout.write(f'{name}: доставлено {count}')
+                delivered += count
+            if options['once']:
+                break
+            if not delivered:
+                time.sleep(options['sleep'])
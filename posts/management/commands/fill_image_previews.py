@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.cdn import INDEX_KEY, post_keys, purge
+from posts.conditional import touch_feeds
+from posts.images import set_image_preview
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Вычисляет основной цвет и заглушку для постов с '
+            'изображениями, загруженных до их появления.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').exclude(image=None).filter(
+            image_color=''
+        ).select_related('group').only('id', 'image', 'author_id',
+                                       'group__slug')
+        batch = []
+        filled = 0
+        for post in posts.iterator(chunk_size=options['batch_size']):
+            set_image_preview(post)
+            if post.image_color:
+                batch.append(post)
+            if len(batch) >= options['batch_size']:
+                filled += self.save(batch)
+        filled += self.save(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Заглушки вычислены для {filled} постов.'
+        ))
+
+    def save(self, batch):
+        """bulk_update не вызывает сигналов, поэтому ``updated`` для ключа
+        карточки и сброс страниц с этими постами делаются здесь."""
+        if not batch:
+            return 0
+        now = timezone.now()
+        keys = {INDEX_KEY}
+        for post in batch:
+            post.updated = now
+            keys.update(post_keys(post))
+        Post.objects.bulk_update(
+            batch, ['image_color', 'image_placeholder', 'updated']
+        )
+        purge(sorted(keys))
+        touch_feeds(sorted(keys))
+        saved = len(batch)
+        batch.clear()
+        return saved
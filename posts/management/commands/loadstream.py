@@ -0,0 +1,220 @@
+import json
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from posts.cdn import INDEX_KEY, author_key, group_key, post_key, purge
+from posts.fingerprints import remember_many
+from posts.follows import forget_following
+from posts.groups import rebuild_summaries
+from posts.models import Comment, Follow, Group, OutboxEvent, Post
+from posts.outbox import build_event, record_many
+
+LOADED_MODELS = (Group, Post, Comment, Follow)
+EVENT_DATES = {Post: 'pub_date', Comment: 'created'}
+MODEL_LABELS = {model._meta.label_lower: model for model in LOADED_MODELS}
+SEPARATORS = '[], \t\r\n'
+
+
+def iter_json_array(stream, chunk_size):
+    """По одному отдаёт объекты JSON-массива, не читая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    for chunk in iter(lambda: stream.read(chunk_size), ''):
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in SEPARATORS:
+                position += 1
+            if position == len(buffer):
+                break
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+            yield obj
+        buffer = buffer[position:]
+    if buffer.strip(']\t\r\n '):
+        raise CommandError('Фикстура обрывается на неполном объекте.')
+
+
+def iter_json_lines(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+@contextmanager
+def raw_dates(models):
+    """Сохраняет даты из фикстуры вместо подстановки auto_now_add."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+@contextmanager
+def deferred_indexes(connection, models):
+    """На время загрузки удаляет вторичные индексы SQLite."""
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    tables = [model._meta.db_table for model in models]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            'AND sql IS NOT NULL AND tbl_name IN (%s)'
+            % ', '.join(['%s'] * len(tables)),
+            tables,
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+    yield
+    with connection.cursor() as cursor:
+        for _, sql in indexes:
+            cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = ('Потоково загружает группы, посты, комментарии и подписки '
+            'из JSON- или JSONL-фикстуры пакетами bulk_create и '
+            'заполняет то, что при сохранении делают сигналы: журнал '
+            'событий, отпечатки текстов, сводки групп и очистку CDN.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture')
+        parser.add_argument('--format', choices=('json', 'jsonl'),
+                            help='По умолчанию определяется по расширению.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--chunk-size', type=int, default=64 * 1024,
+                            help='Размер блока чтения JSON-массива.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        fixture_format = options['format'] or (
+            'jsonl' if options['fixture'].endswith('.jsonl') else 'json'
+        )
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        self.using = options['database']
+        connection = connections[self.using]
+        self.loaded = 0
+        self.skipped = 0
+        self.purged_keys = {INDEX_KEY}
+        self.group_ids = set()
+        self.followers = set()
+        self.started = time.perf_counter()
+        with open(options['fixture'], encoding='utf-8') as stream:
+            if fixture_format == 'jsonl':
+                records = iter_json_lines(stream)
+            else:
+                records = iter_json_array(stream, options['chunk_size'])
+            with transaction.atomic(using=self.using), \
+                    connection.constraint_checks_disabled(), \
+                    raw_dates(LOADED_MODELS + (OutboxEvent,)):
+                with deferred_indexes(connection, LOADED_MODELS):
+                    self.load(records)
+                connection.check_constraints(table_names=[
+                    model._meta.db_table for model in LOADED_MODELS
+                ])
+                self.reset_sequences(connection)
+                rebuild_summaries(self.using)
+                self.purge_loaded()
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {self.loaded} объектов за {elapsed:.2f} с '
+            f'({self.loaded / elapsed:.0f} объектов/с), '
+            f'пропущено {self.skipped}.'
+        ))
+
+    def load(self, records):
+        batches = {model: [] for model in LOADED_MODELS}
+        for record in records:
+            model = MODEL_LABELS.get(record.get('model'))
+            if model is None:
+                self.skipped += 1
+                continue
+            deserialized = next(Deserializer([record], using=self.using))
+            batch = batches[model]
+            batch.append(deserialized.object)
+            if len(batch) >= self.batch_size:
+                self.flush(model, batch)
+        for model, batch in batches.items():
+            self.flush(model, batch)
+
+    def flush(self, model, batch):
+        if not batch:
+            return
+        model.objects.using(self.using).bulk_create(batch)
+        self.derive(model, batch)
+        self.loaded += len(batch)
+        batch.clear()
+        if self.verbosity > 1:
+            elapsed = time.perf_counter() - self.started
+            self.stdout.write(
+                f'{self.loaded} объектов, {self.loaded / elapsed:.0f}/с'
+            )
+
+    def derive(self, model, batch):
+        """Делает для пакета то, что bulk_create пропускает вместе с
+        сигналами; событие журнала получает дату самого объекта, чтобы
+        старые посты не попали в популярные.
+        """
+        if model is Group:
+            self.purged_keys.update(group_key(group.slug) for group in batch)
+            return
+        now = timezone.now()
+        date_field = EVENT_DATES.get(model)
+        record_many([
+            build_event(obj, OutboxEvent.CREATED, created=(
+                getattr(obj, date_field) if date_field else now
+            ))
+            for obj in batch
+        ], self.using)
+        if model is Follow:
+            self.purged_keys.update(
+                author_key(follow.author_id) for follow in batch
+            )
+            self.followers.update(follow.user_id for follow in batch)
+            return
+        remember_many(model._meta.model_name, batch, self.using)
+        for obj in batch:
+            if model is Post:
+                self.purged_keys.update(
+                    (post_key(obj.pk), author_key(obj.author_id))
+                )
+                if obj.group_id:
+                    self.group_ids.add(obj.group_id)
+            else:
+                self.purged_keys.add(post_key(obj.post_id))
+
+    def purge_loaded(self):
+        self.purged_keys.update(
+            group_key(slug) for slug in Group.objects.using(
+                self.using
+            ).filter(id__in=self.group_ids).values_list('slug', flat=True)
+        )
+        purge(sorted(self.purged_keys))
+        for user_id in self.followers:
+            forget_following(user_id)
+
+    def reset_sequences(self, connection):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), LOADED_MODELS
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
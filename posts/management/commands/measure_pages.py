@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.templatetags.static import static
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+OWN_MIDDLEWARE = ('yatube.compression.CompressionMiddleware',
+                  'yatube.compression.MinifyHTMLMiddleware')
+ENCODINGS = ('identity', 'gzip', 'br')
+ASSETS = ('bootstrap/dist/css/bootstrap.min.css',
+          'jquery/dist/jquery.min.js',
+          'bootstrap/dist/js/bootstrap.min.js')
+
+
+class Command(BaseCommand):
+    help = ('Измеряет размер страниц и статики на проводе без сжатия и '
+            'минификации и с ними.')
+
+    def handle(self, *args, **options):
+        paths = self.paths()
+        plain = [name for name in settings.MIDDLEWARE
+                 if name not in OWN_MIDDLEWARE]
+        with override_settings(MIDDLEWARE=plain):
+            before = {path: self.size(path, 'identity') for path in paths}
+        for path in paths:
+            sizes = ', '.join(
+                f'{encoding} {self.size(path, encoding)}'
+                for encoding in ENCODINGS
+            )
+            self.stdout.write(f'{path}: было {before[path]}, стало {sizes}')
+
+    def paths(self):
+        paths = [reverse('index'), reverse('group_index')]
+        group = Group.objects.first()
+        if group is not None:
+            paths.append(group.get_absolute_url())
+        post = Post.objects.select_related('author').first()
+        if post is not None:
+            paths.append(post.author.get_absolute_url())
+            paths.append(post.get_absolute_url())
+        return paths + [static(asset) for asset in ASSETS]
+
+    def size(self, path, encoding):
+        response = Client(HTTP_HOST='localhost').get(
+            path, HTTP_ACCEPT_ENCODING=encoding
+        )
+        if response.streaming:
+            return len(b''.join(response.streaming_content))
+        return len(response.content)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts.groups import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сводки всех групп, например после loaddata, '
+            'который сохраняет объекты без сигналов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_summaries(options['database'])
+        self.stdout.write(f'Пересчитано сводок: {rebuilt}')
@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.models import Task
+from posts.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в БД.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='Пауза, когда очередь пуста, в секундах.')
+        parser.add_argument('--once', action='store_true',
+                            help='Разобрать готовые задачи и выйти.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending(options['batch_size'])
+            if processed and options['verbosity'] > 1:
+                self.stdout.write(f'Выполнено задач: {processed}')
+            if options['once'] and not processed:
+                break
+            if not processed:
+                Task.objects.filter(
+                    status=Task.DONE,
+                    run_after__lt=timezone.now() - timedelta(
+                        seconds=settings.TASKS_KEEP_DONE_SECONDS
+                    ),
+                ).delete()
+                time.sleep(options['sleep'])
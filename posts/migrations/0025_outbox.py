@@ -0,0 +1,42 @@
+# Generated by Django 2.2.6 on 2026-10-19 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0024_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumer', models.CharField(max_length=100, unique=True, verbose_name='Потребитель')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Последнее событие')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'позиция потребителя',
+                'verbose_name_plural': 'позиции потребителей',
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=50, verbose_name='Тема')),
+                ('action', models.CharField(choices=[('created', 'создан'), ('updated', 'изменён'), ('deleted', 'удалён')], max_length=10, verbose_name='Действие')),
+                ('object_id', models.PositiveIntegerField(verbose_name='ID объекта')),
+                ('payload', models.TextField(default='{}', verbose_name='Данные')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата события')),
+            ],
+            options={
+                'verbose_name': 'событие',
+                'verbose_name_plural': 'журнал событий',
+                'ordering': ['id'],
+            },
+        ),
+    ]
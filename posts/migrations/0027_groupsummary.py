@@ -0,0 +1,62 @@
+# Generated by Django 2.2.6 on 2026-10-19 19:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+import json
+
+from django.db.models import Count, Max
+
+# Размер первой страницы группы на момент миграции; сводка другого
+# размера не используется и пересобирается при записи в группу.
+FIRST_PAGE_SIZE = 10
+
+
+def fill_summaries(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupSummary = apps.get_model('posts', 'GroupSummary')
+    Post = apps.get_model('posts', 'Post')
+    summaries = []
+    for group in Group.objects.annotate(
+        posts_count=Count('posts', distinct=True),
+        last_post=Max('posts__pub_date'),
+        last_comment=Max('posts__comments__created'),
+    ):
+        first_page = Post.objects.filter(group=group).order_by(
+            '-pub_date'
+        ).values_list('id', flat=True)[:FIRST_PAGE_SIZE]
+        summaries.append(GroupSummary(
+            group=group,
+            posts_count=group.posts_count,
+            last_activity=max(
+                filter(None, [group.last_post, group.last_comment]),
+                default=None
+            ),
+            first_page=json.dumps(list(first_page)),
+        ))
+    GroupSummary.objects.bulk_create(summaries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0026_trendingpost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupSummary',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Число постов')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+                ('first_page', models.TextField(default='[]', verbose_name='Первая страница')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'сводка группы',
+                'verbose_name_plural': 'сводки групп',
+                'ordering': ['-posts_count'],
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
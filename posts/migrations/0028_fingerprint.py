@@ -0,0 +1,35 @@
+# Generated by Django 2.2.6 on 2026-10-19 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0027_groupsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Fingerprint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Пост'), ('comment', 'Комментарий')], max_length=10, verbose_name='Тип')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id объекта')),
+                ('simhash', models.BigIntegerField(verbose_name='SimHash')),
+                ('band_0', models.PositiveIntegerField(db_index=True)),
+                ('band_1', models.PositiveIntegerField(db_index=True)),
+                ('band_2', models.PositiveIntegerField(db_index=True)),
+                ('band_3', models.PositiveIntegerField(db_index=True)),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'отпечаток текста',
+                'verbose_name_plural': 'отпечатки текстов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='fingerprint',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_fingerprint'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.6 on 2026-10-19 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0029_post_image_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=200, verbose_name='Ключ')),
+                ('window', models.BigIntegerField(verbose_name='Номер периода')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Запросов')),
+                ('expires', models.BigIntegerField(db_index=True, verbose_name='Устаревает')),
+            ],
+            options={
+                'verbose_name': 'счётчик запросов',
+                'verbose_name_plural': 'счётчики запросов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ratecounter',
+            constraint=models.UniqueConstraint(fields=('key', 'window'), name='unique_rate_counter'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.6 on 2026-10-19 21:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0030_ratecounter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='updated',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.6 on 2026-10-19 21:40
+
+from django.db import migrations
+from django.db.models import Max
+
+# Потребители, которые заменили сигналы: всё, что уже в журнале, сигналы
+# успели учесть, поэтому журнал они читают с текущего конца.
+CONSUMERS = ('cdn', 'fingerprints', 'group_summaries', 'thumbnails')
+
+
+def start_at_end(apps, schema_editor):
+    OutboxEvent = apps.get_model('posts', 'OutboxEvent')
+    OutboxCheckpoint = apps.get_model('posts', 'OutboxCheckpoint')
+    position = OutboxEvent.objects.aggregate(last=Max('id'))['last'] or 0
+    for name in CONSUMERS:
+        OutboxCheckpoint.objects.get_or_create(
+            consumer=name, defaults={'position': position}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0031_post_updated_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(start_at_end, migrations.RunPython.noop),
+    ]
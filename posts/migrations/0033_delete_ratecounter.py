@@ -0,0 +1,16 @@
+# Generated by Django 2.2.6 on 2026-10-19 20:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0032_derived_data_consumers'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='RateCounter',
+        ),
+    ]
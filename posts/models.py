@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
+
+from .links import comment_url, group_url, post_edit_url, post_url
 
 User = get_user_model()
 
@@ -23,6 +26,9 @@ class Group(models.Model):
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return group_url(self.slug)
+
     class Meta:
         verbose_name = 'Группа'
         verbose_name_plural = 'Группы'
@@ -31,6 +37,9 @@ class Group(models.Model):
 class Post(models.Model):
     text = models.TextField('Текст', help_text='Введите текст')
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
+    # Не auto_now: у поля должно быть значение по умолчанию, иначе
+    # фикстуры без него не загружаются; время правки ставит save().
+    updated = models.DateTimeField('Дата изменения', default=timezone.now)
     author = models.ForeignKey(User,
                                on_delete=models.CASCADE,
                                related_name='posts', verbose_name='Автор'
@@ -42,10 +51,40 @@ class Post(models.Model):
                               related_name='posts', verbose_name='группа',
                               help_text='Выберете группу')
     image = models.ImageField(upload_to='posts/', blank=True, null=True)
+    image_color = models.CharField(
+        'Основной цвет изображения', max_length=7, blank=True
+    )
+    image_placeholder = models.TextField(
+        'Заглушка изображения', blank=True,
+        help_text='Крошечная копия изображения в виде data URI'
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        # Группа на момент загрузки: по ней сигналы узнают о переносе
+        # поста без лишнего SELECT перед сохранением.
+        if 'group_id' in field_names:
+            post.loaded_group_id = post.group_id
+        return post
+
+    def save(self, *args, **kwargs):
+        self.updated = timezone.now()
+        super().save(*args, **kwargs)
+        self.loaded_group_id = self.group_id
 
     def __str__(self):
         return f'Автор: {self.author} Текст: {self.text[:15]}'
 
+    def get_absolute_url(self):
+        return post_url(self.author.username, self.pk)
+
+    def get_edit_url(self):
+        return post_edit_url(self.author.username, self.pk)
+
+    def get_comment_url(self):
+        return comment_url(self.author.username, self.pk)
+
     class Meta:
         verbose_name = 'пост'
         verbose_name_plural = 'Посты'
@@ -75,6 +114,10 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['post', '-created', '-id'],
+                         name='comment_post_created_idx'),
+        ]
 
 
 class Follow(models.Model):
@@ -102,3 +145,162 @@ class Follow(models.Model):
     def __str__(self):
         return (f'{self.user.username} подписывается на автора '
                 f'{self.author.username}')
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'в очереди'),
+        (RUNNING, 'выполняется'),
+        (DONE, 'выполнена'),
+        (FAILED, 'ошибка'),
+    ]
+
+    name = models.CharField('Задача', max_length=100)
+    payload = models.TextField('Параметры', default='{}')
+    idempotency_key = models.CharField(
+        'Ключ идемпотентности',
+        max_length=255,
+        unique=True,
+        blank=True,
+        null=True
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    run_after = models.DateTimeField('Выполнить после', default=timezone.now)
+    claimed_by = models.CharField('Воркер', max_length=32, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'фоновые задачи'
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'],
+                         name='task_status_run_after_idx'),
+        ]
+
+
+class OutboxEvent(models.Model):
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTIONS = [
+        (CREATED, 'создан'),
+        (UPDATED, 'изменён'),
+        (DELETED, 'удалён'),
+    ]
+
+    topic = models.CharField('Тема', max_length=50)
+    action = models.CharField('Действие', max_length=10, choices=ACTIONS)
+    object_id = models.PositiveIntegerField('ID объекта')
+    payload = models.TextField('Данные', default='{}')
+    created = models.DateTimeField('Дата события', auto_now_add=True)
+
+    def __str__(self):
+        return f'#{self.pk} {self.topic} {self.object_id} {self.action}'
+
+    class Meta:
+        verbose_name = 'событие'
+        verbose_name_plural = 'журнал событий'
+        ordering = ['id']
+
+
+class OutboxCheckpoint(models.Model):
+    consumer = models.CharField('Потребитель', max_length=100, unique=True)
+    position = models.PositiveIntegerField('Последнее событие', default=0)
+    updated = models.DateTimeField('Дата изменения', auto_now=True)
+
+    def __str__(self):
+        return f'{self.consumer}: {self.position}'
+
+    class Meta:
+        verbose_name = 'позиция потребителя'
+        verbose_name_plural = 'позиции потребителей'
+
+
+class TrendingPost(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Пост'
+    )
+    score = models.FloatField('Рейтинг', db_index=True)
+    updated = models.DateTimeField('Дата изменения', auto_now=True)
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.3f}'
+
+    class Meta:
+        verbose_name = 'популярный пост'
+        verbose_name_plural = 'популярные посты'
+        ordering = ['-score']
+
+
+class GroupSummary(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary',
+        verbose_name='Группа'
+    )
+    posts_count = models.PositiveIntegerField('Число постов', default=0)
+    last_activity = models.DateTimeField(
+        'Последняя активность', null=True, blank=True
+    )
+    first_page = models.TextField('Первая страница', default='[]')
+    updated = models.DateTimeField('Дата изменения', auto_now=True)
+
+    def __str__(self):
+        return f'{self.group_id}: {self.posts_count}'
+
+    class Meta:
+        verbose_name = 'сводка группы'
+        verbose_name_plural = 'сводки групп'
+        ordering = ['-posts_count']
+
+
+class Fingerprint(models.Model):
+    POST = 'post'
+    COMMENT = 'comment'
+    KINDS = [
+        (POST, 'Пост'),
+        (COMMENT, 'Комментарий'),
+    ]
+
+    kind = models.CharField('Тип', max_length=10, choices=KINDS)
+    object_id = models.PositiveIntegerField('Id объекта')
+    simhash = models.BigIntegerField('SimHash')
+    band_0 = models.PositiveIntegerField(db_index=True)
+    band_1 = models.PositiveIntegerField(db_index=True)
+    band_2 = models.PositiveIntegerField(db_index=True)
+    band_3 = models.PositiveIntegerField(db_index=True)
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}: {self.simhash:x}'
+
+    class Meta:
+        verbose_name = 'отпечаток текста'
+        verbose_name_plural = 'отпечатки текстов'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='unique_fingerprint'
+            )
+        ]
@@ -0,0 +1,115 @@
+"""Пагинация лент: размер страницы, сокращённый список страниц, режим
+без COUNT.
+
+Размер страницы задаётся для каждой ленты в ``FEED_PAGE_SIZES``, клиент
+может попросить другой параметром ``?per_page=``, но не больше
+``MAX_PAGE_SIZE``.
+
+``elided_page_range`` оставляет в навигации первые и последние страницы
+и окно вокруг текущей, поэтому число ссылок не растёт с размером ленты.
+Клиенты с бесконечной прокруткой передают ``?nocount=1`` и получают
+``NoCountPaginator``: он не считает строки, а о следующей странице
+узнаёт по одной лишней строке выборки.
+"""
+from django.conf import settings
+from django.core.paginator import (EmptyPage, Page, PageNotAnInteger,
+                                   Paginator)
+
+NO_COUNT_PARAM = 'nocount'
+PAGE_SIZE_PARAM = 'per_page'
+
+
+class NoCountPaginator(Paginator):
+    last_number = 1
+
+    @property
+    def count(self):
+        return None
+
+    @property
+    def num_pages(self):
+        return self.last_number
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        self.last_number = number + 1 if has_more else number
+        return Page(rows[:self.per_page], number, self)
+
+    def get_page(self, number):
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            return self.page(1)
+
+
+def no_count(request):
+    return request.GET.get(NO_COUNT_PARAM) == '1'
+
+
+def default_page_size(feed):
+    return settings.FEED_PAGE_SIZES.get(feed, settings.POSTS_ON_PAGE)
+
+
+def page_size(request, feed):
+    """Размер страницы ленты ``feed`` с учётом запроса клиента."""
+    try:
+        size = int(request.GET[PAGE_SIZE_PARAM])
+    except (KeyError, ValueError):
+        return default_page_size(feed)
+    return min(max(size, 1), settings.MAX_PAGE_SIZE)
+
+
+def make_paginator(request, object_list, per_page):
+    """Пагинатор ленты; без COUNT, если клиент об этом попросил."""
+    if no_count(request):
+        return NoCountPaginator(object_list, per_page)
+    return Paginator(object_list, per_page)
+
+
+def elided_page_range(page, on_each_side=2, on_ends=1):
+    """Номера страниц для навигации, ``None`` на месте пропуска."""
+    num_pages = page.paginator.num_pages
+    if num_pages <= (on_each_side + on_ends) * 2 + 1:
+        return list(range(1, num_pages + 1))
+    pages = []
+    window_start = max(page.number - on_each_side, 1)
+    window_end = min(page.number + on_each_side, num_pages)
+    if window_start > on_ends + 1:
+        pages.extend(range(1, on_ends + 1))
+        pages.append(None)
+    else:
+        window_start = 1
+    if window_end < num_pages - on_ends:
+        pages.extend(range(window_start, window_end + 1))
+        pages.append(None)
+        pages.extend(range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        pages.extend(range(window_start, num_pages + 1))
+    return pages
+
+
+def page_query(request):
+    """Параметры запроса, которые ссылки навигации сохраняют."""
+    query = request.GET.copy()
+    query.pop('page', None)
+    return f'{query.urlencode()}&' if query else ''
+
+
+def page_context(request, page):
+    return {
+        'page': page,
+        'page_range': elided_page_range(page),
+        'page_query': page_query(request),
+    }
@@ -0,0 +1,62 @@
+"""Фоновый прогрев карточек следующей страницы ленты.
+
+При ``PREFETCH_NEXT_PAGE`` после рендеринга страницы представление
+отдаёт общему пулу из ``PREFETCH_WORKERS`` потоков задачу выбрать посты
+следующей страницы и положить их карточки в кэш. Клиент с бесконечной
+прокруткой, запросив следующую страницу, получает её из готовых
+фрагментов. В очереди пула не больше ``PREFETCH_QUEUE_SIZE`` задач:
+прогрев — только оптимизация, и под нагрузкой он пропускается, а не
+копится. Потоки пула держат по одному соединению с БД и закрывают его
+по тем же правилам ``CONN_MAX_AGE``, что и обработчики запросов.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .templatetags.post_cards import warm_cards
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=settings.PREFETCH_WORKERS,
+                              thread_name_prefix='prefetch')
+slots = threading.BoundedSemaphore(settings.PREFETCH_QUEUE_SIZE)
+
+
+def run_in_background(function, *args):
+    """Выполняет ``function`` в пуле; ``False``, если очередь полна."""
+    slot = slots
+    if not slot.acquire(blocking=False):
+        return False
+
+    def target():
+        close_old_connections()
+        try:
+            function(*args)
+        except Exception:
+            logger.exception('Прогрев следующей страницы не удался')
+        finally:
+            close_old_connections()
+            slot.release()
+    executor.submit(target)
+    return True
+
+
+def next_page_posts(object_list, number, per_page):
+    bottom = (number - 1) * per_page
+    return list(object_list[bottom:bottom + per_page])
+
+
+def warm_next_page(page):
+    """Прогревает в фоне карточки страницы, следующей за ``page``."""
+    if not settings.PREFETCH_NEXT_PAGE or not page.has_next():
+        return
+    paginator = page.paginator
+    run_in_background(
+        lambda: warm_cards(next_page_posts(
+            paginator.object_list, page.next_page_number(),
+            paginator.per_page
+        ))
+    )
@@ -0,0 +1,109 @@
+"""Очередь фоновых задач в таблице БД без внешнего брокера.
+
+Задача ставится в очередь в той же транзакции, что и запись, которая её
+породила, и выполняется командой ``runtasks``. Упавшие задачи
+повторяются с экспоненциальной задержкой до ``TASKS_MAX_ATTEMPTS`` раз.
+Задачи с ``batch=True`` получают сразу все захваченные параметры одного
+имени. Захват строк через UPDATE позволяет запускать несколько
+воркеров: задача в статусе «выполняется» с истёкшим ``run_after``
+считается брошенной и захватывается заново.
+"""
+import json
+import logging
+import traceback
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def task(name, batch=False):
+    """Регистрирует обработчик задачи с именем ``name``."""
+    def decorator(handler):
+        HANDLERS[name] = (handler, batch)
+        return handler
+    return decorator
+
+
+def enqueue(name, payload=None, key=None, delay=0):
+    """Ставит задачу в очередь; повтор с тем же ``key`` игнорируется."""
+    fields = {
+        'name': name,
+        'payload': json.dumps(payload or {}),
+        'run_after': timezone.now() + timedelta(seconds=delay),
+    }
+    if key is None:
+        return Task.objects.create(**fields)
+    return Task.objects.get_or_create(idempotency_key=key,
+                                      defaults=fields)[0]
+
+
+def claim(limit):
+    now = timezone.now()
+    due = Task.objects.filter(
+        Q(status=Task.PENDING) | Q(status=Task.RUNNING),
+        run_after__lte=now,
+    ).values_list('id', flat=True)[:limit]
+    token = uuid.uuid4().hex
+    Task.objects.filter(id__in=list(due)).filter(
+        Q(status=Task.PENDING) | Q(status=Task.RUNNING, run_after__lte=now)
+    ).update(
+        status=Task.RUNNING,
+        claimed_by=token,
+        run_after=now + timedelta(seconds=settings.TASKS_LEASE_SECONDS),
+    )
+    return list(Task.objects.filter(claimed_by=token, status=Task.RUNNING))
+
+
+def run_pending(limit=100):
+    """Выполняет до ``limit`` готовых задач и возвращает их число."""
+    claimed = claim(limit)
+    by_name = defaultdict(list)
+    for claimed_task in claimed:
+        by_name[claimed_task.name].append(claimed_task)
+    for name, tasks in by_name.items():
+        handler, batch = HANDLERS.get(name, (None, False))
+        if handler is None:
+            fail(tasks, f'Неизвестная задача {name}')
+            continue
+        groups = [tasks] if batch else [[one] for one in tasks]
+        for group in groups:
+            payloads = [json.loads(one.payload) for one in group]
+            try:
+                if batch:
+                    handler(payloads)
+                else:
+                    handler(**payloads[0])
+            except Exception:
+                logger.exception('Задача %s упала', name)
+                fail(group, traceback.format_exc())
+            else:
+                Task.objects.filter(id__in=[one.id for one in group]).update(
+                    status=Task.DONE, last_error=''
+                )
+    return len(claimed)
+
+
+def fail(tasks, error):
+    now = timezone.now()
+    for failed in tasks:
+        failed.attempts += 1
+        failed.last_error = error
+        if failed.attempts >= settings.TASKS_MAX_ATTEMPTS:
+            failed.status = Task.FAILED
+        else:
+            failed.status = Task.PENDING
+            failed.run_after = now + timedelta(
+                seconds=settings.TASKS_RETRY_DELAY * 2 ** (failed.attempts - 1)
+            )
+        failed.save(update_fields=['attempts', 'last_error', 'status',
+                                   'run_after'])
@@ -0,0 +1,168 @@
+"""Обработчики сигналов моделей.
+
+В транзакции записи остаются только событие журнала и сброс версий в
+кэше; сводки групп, отпечатки, очистку CDN, миниатюры и рейтинг строят
+потребители журнала (см. ``posts.outbox``).
+
+При загрузке фикстуры (``raw``) связанные строки могут ещё не
+существовать, поэтому обработчики ничего не выводят из сохранённого
+объекта; сводки групп после ``loaddata`` пересчитывает команда
+``rebuild_summaries``.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cdn import INDEX_KEY, author_key, group_key, post_key, post_keys, purge
+from .conditional import follower_key, touch_feeds
+from .follows import forget_following
+from .groups import refresh_summary
+from .images import set_image_preview
+from .models import Comment, Follow, Group, OutboxEvent, Post, User
+from .outbox import record
+from .trending import follow_payload
+
+
+def moved_from_group(post):
+    """Прежняя группа перенесённого поста или ``None``."""
+    loaded = getattr(post, 'loaded_group_id', post.group_id)
+    return loaded if loaded != post.group_id else None
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def touch_post_feeds(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    keys = [INDEX_KEY] + post_keys(instance)
+    old_group_id = moved_from_group(instance)
+    if old_group_id is not None:
+        keys.extend(group_key(slug) for slug in Group.objects.filter(
+            pk=old_group_id
+        ).values_list('slug', flat=True))
+    touch_feeds(keys)
+
+
+@receiver(pre_save, sender=Post)
+def preview_uploaded_image(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    if not instance.image or not instance.image._committed:
+        set_image_preview(instance)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_comment_feeds(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    keys = [INDEX_KEY, post_key(instance.post_id)]
+    post = Post.objects.filter(pk=instance.post_id).values_list(
+        'author_id', 'group__slug'
+    ).first()
+    if post is not None:
+        author_id, group_slug = post
+        keys.append(author_key(author_id))
+        if group_slug:
+            keys.append(group_key(group_slug))
+    touch_feeds(keys)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def purge_group(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    purge([group_key(instance.slug)])
+    touch_feeds([group_key(instance.slug)])
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def forget_follow_set(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    forget_following(instance.user_id)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def touch_follow_feeds(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    touch_feeds([author_key(instance.author_id),
+                 follower_key(instance.user_id)])
+
+
+@receiver(post_save, sender=User)
+def purge_author(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    purge([author_key(instance.pk)])
+    touch_feeds([author_key(instance.pk)])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Follow)
+def record_saved(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    if created:
+        record(instance, OutboxEvent.CREATED,
+               follow_payload(instance) if sender is Follow else None)
+        return
+    extra = None
+    if sender is Post and moved_from_group(instance) is not None:
+        extra = {'old_group_id': moved_from_group(instance)}
+    record(instance, OutboxEvent.UPDATED, extra)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Follow)
+def record_deleted(sender, instance, **kwargs):
+    record(instance, OutboxEvent.DELETED)
+
+
+@receiver(post_save, sender=Group)
+def create_group_summary(sender, instance, created, **kwargs):
+    if created and not kwargs.get('raw'):
+        refresh_summary(instance.pk)
+
+
+# Поля автора и группы, которые видны на карточке поста.
+CARD_FIELDS = {User: ('username',), Group: ('title', 'slug')}
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Group)
+def remember_card_fields(sender, instance, update_fields=None, **kwargs):
+    fields = CARD_FIELDS[sender]
+    instance._saved_card_fields = None
+    if kwargs.get('raw') or instance.pk is None or (
+            update_fields is not None and not set(fields) & update_fields):
+        return
+    instance._saved_card_fields = sender.objects.filter(
+        pk=instance.pk
+    ).values_list(*fields).first()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Group)
+def touch_card_posts(sender, instance, **kwargs):
+    """Сдвигает ``updated`` постов, если поменялось видимое на карточке,
+    и сбрасывает страницы, на которых эти карточки показаны."""
+    saved = getattr(instance, '_saved_card_fields', None)
+    fields = CARD_FIELDS[sender]
+    if saved is None or saved == tuple(
+            getattr(instance, field) for field in fields):
+        return
+    lookup = 'author' if sender is User else 'group'
+    posts = Post.objects.filter(**{lookup: instance})
+    keys = [INDEX_KEY]
+    for post_id, author_id in posts.values_list('id', 'author_id'):
+        keys.extend((post_key(post_id), author_key(author_id)))
+    posts.update(updated=timezone.now())
+    purge(keys)
+    touch_feeds(keys)
@@ -0,0 +1,68 @@
+"""Кэш отрендеренных карточек постов.
+
+Карточка кэшируется по id поста, времени его изменения и числу
+комментариев, поэтому правка поста и новый комментарий сразу дают новый
+ключ без записи в пост; смена имени автора и переименование группы
+сдвигают ``Post.updated`` сигналами. Кнопки, зависящие от пользователя,
+подставляются в готовую карточку вместо метки ``ACTIONS``. Ленты
+выбирают посты через ``card_posts``, чтобы промах кэша не стоил
+запросов на каждую карточку.
+"""
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+ACTIONS = '<!-- post-actions -->'
+
+
+def comments_count(post):
+    if not hasattr(post, 'comments_count'):
+        post.comments_count = post.comments.count()
+    return post.comments_count
+
+
+def card_key(post):
+    return (f'post_card:{post.pk}:{post.updated.timestamp()}:'
+            f'{comments_count(post)}')
+
+
+def card_posts(posts):
+    """Посты вместе с автором, группой и числом комментариев."""
+    return posts.select_related('author', 'group').annotate(
+        comments_count=Count('comments')
+    )
+
+
+def render_card(post):
+    return render_to_string('auxiliary/post_card.html', {'post': post})
+
+
+def warm_cards(posts):
+    """Рендерит в кэш карточки постов, которых там ещё нет."""
+    keys = {card_key(post): post for post in posts}
+    missing = set(keys) - set(cache.get_many(list(keys)))
+    cache.set_many(
+        {key: render_card(keys[key]) for key in missing},
+        settings.POST_CARD_CACHE_TIMEOUT
+    )
+    return len(missing)
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    key = card_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = render_card(post)
+        cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    actions = ''
+    user = context.get('user')
+    if user is not None and user.pk == post.author_id:
+        actions = render_to_string('auxiliary/post_actions.html',
+                                   {'post': post})
+    return mark_safe(html.replace(ACTIONS, actions))
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class FeedApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Sasha')
+        cls.group = Group.objects.create(
+            title='Бизнес',
+            slug='business',
+            description='Для публикации офферов',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост',
+            author=cls.author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='Masha')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_feeds_return_posts(self):
+        """Ленты API отдают компактный JSON с постами."""
+        urls = [
+            reverse('api_index'),
+            reverse('api_group', args=[self.group.slug]),
+            reverse('api_profile', args=[self.author.username]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                payload = self.guest_client.get(url).json()
+                self.assertEqual(payload['count'], 1)
+                self.assertEqual(payload['results'][0]['group'],
+                                 self.group.slug)
+
+    def test_post_with_comments(self):
+        """API поста отдаёт пост вместе с комментариями."""
+        Comment.objects.create(post=self.post, author=self.user,
+                               text='Комментарий')
+        payload = self.guest_client.get(
+            reverse('api_post', args=[self.author.username, self.post.id])
+        ).json()
+        self.assertEqual(payload['post']['comments'], 1)
+        self.assertEqual(payload['comments'][0]['author'],
+                         self.user.username)
+
+    def test_follow_feed(self):
+        """Лента подписок требует авторизации."""
+        url = reverse('api_follow')
+        self.assertEqual(self.guest_client.get(url).status_code, 401)
+        Follow.objects.create(user=self.user, author=self.author)
+        payload = self.authorized_client.get(url).json()
+        self.assertEqual(payload['results'][0]['id'], self.post.id)
+
+    def test_not_modified(self):
+        """Неизменившаяся лента отвечает 304 до первого изменения."""
+        url = reverse('api_index')
+        response = self.guest_client.get(url)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Comment.objects.create(post=self.post, author=self.user,
+                               text='Новый комментарий')
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from django.test import SimpleTestCase
+
+from yatube.asgi import ThreadPoolWsgiToAsgi
+
+DELAY = 0.2
+REQUESTS = 4
+
+
+def slow_view(environ, start_response):
+    time.sleep(DELAY)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+class AsgiEntryPointTest(SimpleTestCase):
+    def request(self, application):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'GET',
+            'path': '/',
+            'root_path': '',
+            'query_string': b'',
+            'headers': [],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 0),
+        }
+        return application(scope, receive, send), messages
+
+    def test_slow_requests_overlap(self):
+        """Медленные запросы выполняются параллельно, а не по очереди."""
+        application = ThreadPoolWsgiToAsgi(slow_view)
+        requests = [self.request(application) for _ in range(REQUESTS)]
+
+        async def main():
+            await asyncio.gather(*(call for call, _ in requests))
+
+        started = time.perf_counter()
+        asyncio.run(main())
+        elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, DELAY * REQUESTS / 2)
+        for _, messages in requests:
+            self.assertEqual(messages[0]['status'], 200)
+            body = b''.join(
+                message.get('body', b'') for message in messages[1:]
+            )
+            self.assertEqual(body, b'ok')
@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.cdn import LocalPurger
+from posts.models import Comment, Group, Post
+from posts.outbox import consume
+
+User = get_user_model()
+
+
+class EdgeCacheHeadersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Sasha')
+        cls.group = Group.objects.create(
+            title='Бизнес',
+            slug='business',
+            description='Для публикации офферов',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый заголовок',
+            author=cls.author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_are_public(self):
+        """Анонимные страницы кэшируются на CDN с surrogate-ключами."""
+        urls = {
+            reverse('index'): 'index',
+            reverse('group', args=[self.group.slug]): 'group-business',
+            reverse('profile', args=[self.author.username]):
+                f'author-{self.author.id}',
+            reverse('post', args=[self.author.username, self.post.id]):
+                f'post-{self.post.id}',
+        }
+        for url, key in urls.items():
+            with self.subTest(url=url):
+                response = Client().get(url)
+                self.assertIn('public', response['Cache-Control'])
+                self.assertIn('s-maxage', response['Cache-Control'])
+                self.assertIn('Cookie', response['Vary'])
+                self.assertIn(key, response['Surrogate-Key'].split())
+
+    def test_authorized_pages_are_private(self):
+        """Страницы авторизованного пользователя CDN не кэширует."""
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(reverse('index'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertFalse(response.has_header('Surrogate-Key'))
+
+
+@override_settings(CDN_PURGER='posts.cdn.LocalPurger')
+class PurgeOnWriteTest(TestCase):
+    def setUp(self):
+        LocalPurger.purged.clear()
+        self.author = User.objects.create_user(username='Sasha')
+        self.group = Group.objects.create(
+            title='Бизнес',
+            slug='business',
+            description='Для публикации офферов',
+        )
+
+    def test_writes_purge_keys(self):
+        """Запись поста и комментария очищает связанные ключи, когда
+        потребитель журнала доходит до события."""
+        post = Post.objects.create(
+            text='Тестовый заголовок',
+            author=self.author,
+            group=self.group,
+        )
+        consume('cdn')
+        self.assertIn(f'post-{post.id}', LocalPurger.purged)
+        self.assertIn('group-business', LocalPurger.purged)
+        self.assertIn(f'author-{self.author.id}', LocalPurger.purged)
+        LocalPurger.purged.clear()
+        Comment.objects.create(post=post, author=self.author, text='Текст')
+        consume('cdn')
+        self.assertEqual(LocalPurger.purged, [f'post-{post.id}'])
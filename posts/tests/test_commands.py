@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from posts.cdn import LocalPurger
+from posts.models import (Comment, Fingerprint, Follow, Group, GroupSummary,
+                          OutboxEvent, Post)
+from posts.queue import run_pending
+
+User = get_user_model()
+
+
+@override_settings(CDN_PURGER='posts.cdn.LocalPurger')
+class LoadStreamCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='Sasha')
+        cls.reader = User.objects.create_user(username='Masha')
+        cls.records = [
+            {'model': 'posts.group', 'pk': 5, 'fields': {
+                'title': 'Бизнес', 'slug': 'business',
+                'description': 'Для публикации офферов'}},
+            {'model': 'posts.post', 'pk': 90, 'fields': {
+                'text': 'Тестовый пост о том, как быстро восстановить '
+                        'ленту из фикстуры', 'author': cls.author.pk,
+                'group': 5, 'pub_date': '2021-04-17T18:14:34.023Z',
+                'image': ''}},
+            {'model': 'posts.comment', 'pk': 1, 'fields': {
+                'post': 90, 'author': cls.reader.pk, 'text': 'Коммент',
+                'created': '2021-04-18T10:00:00Z'}},
+            {'model': 'posts.follow', 'pk': 9, 'fields': {
+                'user': cls.reader.pk, 'author': cls.author.pk}},
+            {'model': 'sessions.session', 'pk': 'abc', 'fields': {}},
+        ]
+
+    def load(self, content, suffix):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w', encoding='utf-8') as fixture:
+            fixture.write(content)
+        try:
+            call_command('loadstream', path, chunk_size=16,
+                         batch_size=2, stdout=StringIO())
+        finally:
+            os.remove(path)
+
+    def check_loaded(self):
+        self.assertTrue(Group.objects.filter(slug='business').exists())
+        post = Post.objects.get(pk=90)
+        self.assertEqual(post.pub_date.year, 2021)
+        self.assertEqual(Comment.objects.get(pk=1).post, post)
+        self.assertTrue(Follow.objects.filter(
+            user=self.reader, author=self.author).exists())
+        summary = GroupSummary.objects.get(group__slug='business')
+        self.assertEqual(summary.posts_count, 1)
+        self.assertEqual(summary.last_activity.day, 18)
+        events = OutboxEvent.objects.filter(action=OutboxEvent.CREATED)
+        self.assertEqual(
+            sorted(events.values_list('topic', 'object_id')),
+            [('comment', 1), ('follow', 9), ('post', 90)]
+        )
+        self.assertEqual(events.get(topic='post').created.year, 2021)
+        self.assertEqual(
+            Fingerprint.objects.filter(kind=Fingerprint.POST).count(), 1
+        )
+        LocalPurger.purged.clear()
+        run_pending()
+        self.assertIn('group-business', LocalPurger.purged)
+        self.assertIn('post-90', LocalPurger.purged)
+
+    def test_load_json_array(self):
+        """JSON-массив загружается по частям с сохранением дат."""
+        self.load(json.dumps(self.records, ensure_ascii=False), '.json')
+        self.check_loaded()
+
+    def test_load_json_lines(self):
+        """JSONL-фикстура загружается построчно."""
+        content = '\n'.join(
+            json.dumps(record, ensure_ascii=False) for record in self.records
+        )
+        self.load(content, '.jsonl')
+        self.check_loaded()
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.comments import comments_page
+from posts.models import Comment, Post
+from yatube.settings import COMMENTS_ON_PAGE
+
+User = get_user_model()
+
+
+class CommentsPageTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Sasha')
+        cls.post = Post.objects.create(text='Пост', author=cls.author)
+        commenters = [
+            User.objects.create_user(username=f'user_{number}')
+            for number in range(5)
+        ]
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=commenters[number % 5],
+                    text=f'Комментарий {number}')
+            for number in range(COMMENTS_ON_PAGE + 3)
+        )
+
+    def test_cursor_walks_all_comments(self):
+        """Курсор обходит все комментарии без повторов."""
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = comments_page(self.post, cursor, 3)
+            seen.extend(comment.id for comment in page)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), COMMENTS_ON_PAGE + 3)
+        self.assertEqual(len(set(seen)), COMMENTS_ON_PAGE + 3)
+
+    def test_fragment_loads_next_comments(self):
+        """Фрагмент «показать ещё» отдаёт следующую страницу."""
+        response = Client().get(
+            reverse('post', args=[self.author.username, self.post.id])
+        )
+        cursor = response.context['next_cursor']
+        response = Client().get(
+            reverse('post_comments', args=[self.author.username,
+                                           self.post.id]),
+            {'cursor': cursor}
+        )
+        self.assertEqual(len(response.context['comments']), 3)
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_authors_loaded_in_bulk(self):
+        """Страница с авторами и проверка продолжения — два запроса."""
+        with self.assertNumQueries(2):
+            page, _ = comments_page(self.post, None, COMMENTS_ON_PAGE)
+            [comment.author.username for comment in page]
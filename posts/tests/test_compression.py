@@ -0,0 +1,126 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from yatube.compression import minify_html, serve_precompressed
+from yatube.storage import serve_static
+
+User = get_user_model()
+
+
+class CompressionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='Sasha')
+        for number in range(5):
+            Post.objects.create(text=f'Пост {number}', author=self.user)
+        self.client = Client()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_minify_keeps_preformatted_blocks(self):
+        """Пробелы схлопываются везде, кроме pre, textarea и script."""
+        html = ('<div>\n    <p>Текст\n  поста</p>\n</div>'
+                '<textarea>  строка\n  строка</textarea>'
+                '<script>\n  var a = 1;\n</script>')
+        self.assertEqual(
+            minify_html(html),
+            '<div> <p>Текст поста</p> </div>'
+            '<textarea>  строка\n  строка</textarea>'
+            '<script>\n  var a = 1;\n</script>'
+        )
+
+    def test_minify_keeps_attribute_values(self):
+        """Пробелы внутри значений атрибутов и в style сохраняются."""
+        html = ('<img\n    src="a.png"\n    alt="два   пробела" '
+                "title='a\n b'><style>\n  p {}\n</style>")
+        self.assertEqual(
+            minify_html(html),
+            '<img src="a.png" alt="два   пробела" '
+            "title='a\n b'><style>\n  p {}\n</style>"
+        )
+
+    def test_csrf_pages_not_compressed(self):
+        """Страница с CSRF-токеном не сжимается."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('new_post'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_page_gzipped(self):
+        """Страница сжимается gzip и распаковывается в тот же HTML."""
+        plain = self.client.get(reverse('index'))
+        compressed = self.client.get(reverse('index'),
+                                     HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertLess(len(compressed.content), len(plain.content))
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotIn(b'\n    ', plain.content)
+
+    @override_settings(COMPRESS_MIN_SIZE=10 ** 6)
+    def test_small_response_not_compressed(self):
+        """Ответ короче порога не сжимается."""
+        response = self.client.get(reverse('index'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_precompressed_static(self):
+        """compress_static готовит .gz, а статика отдаётся уже сжатой."""
+        with open(os.path.join(self.root, 'site.css'), 'w') as css:
+            css.write('body { margin: 0; }\n' * 100)
+        call_command('compress_static', root=self.root, stdout=StringIO())
+        self.assertTrue(os.path.exists(os.path.join(self.root,
+                                                    'site.css.gz')))
+        request = RequestFactory().get('/static/site.css',
+                                       HTTP_ACCEPT_ENCODING='gzip')
+        response = serve_precompressed(request, 'site.css',
+                                       document_root=self.root)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['Content-Type'].startswith('text/css'))
+        content = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(content).decode(),
+                         'body { margin: 0; }\n' * 100)
+
+
+class StaticPipelineTest(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        with open(os.path.join(self.source, 'site.css'), 'w') as css:
+            css.write('body { margin: 0; }\n' * 100)
+
+    def test_unhashed_names_before_collectstatic(self):
+        """Пока статика не собрана, ссылки ведут на исходные имена."""
+        with self.settings(STATIC_ROOT=self.root,
+                           STATICFILES_DIRS=[self.source]):
+            self.assertEqual(static('site.css'), '/static/site.css')
+
+    def test_collectstatic_hashes_and_compresses(self):
+        """collectstatic хэширует имена, сжимает и отдаёт их immutable."""
+        with self.settings(STATIC_ROOT=self.root,
+                           STATICFILES_DIRS=[self.source]):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            url = static('site.css')
+            self.assertRegex(url, r'^/static/site\.[0-9a-f]{12}\.css$')
+            name = url[len('/static/'):]
+            self.assertTrue(os.path.exists(
+                os.path.join(self.root, name + '.gz')
+            ))
+            request = RequestFactory().get(url, HTTP_ACCEPT_ENCODING='gzip')
+            response = serve_static(request, name)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertIn('immutable', response['Cache-Control'])
+            plain = serve_static(RequestFactory().get('/'), 'site.css')
+            self.assertNotIn('Cache-Control', plain)
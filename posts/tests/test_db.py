@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.db import OperationalError, connection, connections, transaction
+from django.test import SimpleTestCase, TestCase
+
+
+class SQLitePragmasTest(TestCase):
+    def test_pragmas_applied_to_connection(self):
+        """Новое соединение получает настройки из SQLITE_PRAGMAS."""
+        expected_pragmas = {
+            'busy_timeout': 5000,
+            'synchronous': 1,
+        }
+        with connection.cursor() as cursor:
+            for name, expected in expected_pragmas.items():
+                with self.subTest(pragma=name):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(cursor.fetchone()[0], expected)
+
+
+class ConcurrentWritersTest(SimpleTestCase):
+    ALIAS = 'concurrent_writers'
+    WRITERS = 8
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        connections.databases[self.ALIAS] = dict(
+            connection.settings_dict,
+            NAME=os.path.join(directory, 'db.sqlite3'),
+        )
+        self.addCleanup(connections.databases.pop, self.ALIAS)
+        self.addCleanup(connections[self.ALIAS].close)
+        with connections[self.ALIAS].cursor() as cursor:
+            cursor.execute('CREATE TABLE counter (value integer)')
+
+    def write(self, errors):
+        try:
+            with transaction.atomic(using=self.ALIAS):
+                with connections[self.ALIAS].cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM counter')
+                    value = cursor.fetchone()[0]
+                    time.sleep(0.01)
+                    cursor.execute(
+                        'INSERT INTO counter (value) VALUES (%s)', [value]
+                    )
+        except OperationalError as error:
+            errors.append(error)
+        finally:
+            connections[self.ALIAS].close()
+
+    def test_read_then_write_transactions_wait_for_lock(self):
+        """Транзакции «прочитать, затем записать» ждут друг друга, а не
+        падают с ``database is locked``."""
+        errors = []
+        writers = [
+            threading.Thread(target=self.write, args=(errors,))
+            for _ in range(self.WRITERS)
+        ]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        self.assertEqual(errors, [])
+        with connections[self.ALIAS].cursor() as cursor:
+            cursor.execute('SELECT value FROM counter ORDER BY value')
+            values = [row[0] for row in cursor.fetchall()]
+        self.assertEqual(values, list(range(self.WRITERS)))
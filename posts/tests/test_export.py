@@ -0,0 +1,79 @@
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class ExportViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Sasha')
+        cls.group = Group.objects.create(
+            title='Бизнес',
+            slug='business',
+            description='Для публикации офферов',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост',
+            author=cls.author,
+            group=cls.group,
+        )
+        Comment.objects.create(
+            post=cls.post,
+            author=cls.author,
+            text='Комментарий автора',
+        )
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.user = User.objects.create_user(username='Masha')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_profile_export_jsonl(self):
+        """Автор выгружает свои посты и комментарии в JSONL."""
+        response = self.author_client.get(
+            reverse('profile_export', args=[self.author.username])
+        )
+        rows = [json.loads(line) for line in self.read(response).split('\n')
+                if line]
+        self.assertEqual([row['type'] for row in rows], ['post', 'comment'])
+        self.assertEqual(rows[0]['group'], self.group.slug)
+
+    def test_profile_export_csv(self):
+        """Выгрузка в CSV начинается с заголовка."""
+        response = self.author_client.get(
+            reverse('profile_export', args=[self.author.username]),
+            {'format': 'csv'}
+        )
+        rows = list(csv.DictReader(self.read(response).splitlines()))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['text'], self.post.text)
+
+    def test_export_forbidden_for_other_users(self):
+        """Чужие данные и группы может выгрузить только персонал."""
+        urls = [
+            reverse('profile_export', args=[self.author.username]),
+            reverse('group_export', args=[self.group.slug]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertEqual(response.status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.fingerprints import simhash
+from posts.forms import DUPLICATE_MESSAGE
+from posts.models import Comment, Fingerprint, Post
+from posts.outbox import consume
+
+User = get_user_model()
+
+SPAM = ('Только сегодня скидки до девяноста процентов на все товары '
+        'нашего магазина, переходите по ссылке и забирайте подарок')
+
+
+class FingerprintTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='Sasha')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_small_edit_keeps_hash_close(self):
+        """Мелкая правка меняет лишь несколько бит отпечатка."""
+        edited = SPAM.replace('сегодня', 'Сегодня!!!')
+        self.assertLessEqual(bin(simhash(SPAM) ^ simhash(edited)).count('1'),
+                             3)
+
+    def test_near_duplicate_post_rejected(self):
+        """Почти одинаковый пост не проходит валидацию формы."""
+        Post.objects.create(text=SPAM, author=self.user)
+        consume('fingerprints')
+        response = self.authorized_client.post(
+            reverse('new_post'), {'text': SPAM.upper() + '!'}
+        )
+        self.assertFormError(response, 'form', 'text', DUPLICATE_MESSAGE)
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_post_edit_ignores_itself(self):
+        """Правка поста не считается дубликатом самого себя."""
+        post = Post.objects.create(text=SPAM, author=self.user)
+        self.authorized_client.post(
+            reverse('post_edit', args=[self.user.username, post.id]),
+            {'text': SPAM + '.'}
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.text, SPAM + '.')
+
+    def test_near_duplicate_comment_rejected(self):
+        """Волна одинаковых комментариев отсекается."""
+        post = Post.objects.create(text='Пост', author=self.user)
+        url = reverse('add_comment', args=[self.user.username, post.id])
+        self.authorized_client.post(url, {'text': SPAM})
+        consume('fingerprints')
+        self.authorized_client.post(url, {'text': SPAM + ' :)'})
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_short_and_deleted_texts_not_indexed(self):
+        """Короткие тексты не индексируются, удаление убирает отпечаток."""
+        Post.objects.create(text='Привет', author=self.user)
+        post = Post.objects.create(text=SPAM, author=self.user)
+        consume('fingerprints')
+        self.assertEqual(Fingerprint.objects.count(), 1)
+        post.delete()
+        consume('fingerprints')
+        self.assertFalse(Fingerprint.objects.exists())
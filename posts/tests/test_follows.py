@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.follows import (following_cache, following_cache_key,
+                           following_ids)
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class FollowingSetTest(TestCase):
+    def setUp(self):
+        following_cache().clear()
+        self.reader = User.objects.create_user(username='Masha')
+        self.author = User.objects.create_user(username='Sasha')
+        self.other = User.objects.create_user(username='Pasha')
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    def follow_queries(self, queries):
+        return [query['sql'] for query in queries.captured_queries
+                if 'posts_follow' in query['sql']
+                and 'COUNT' not in query['sql']]
+
+    def test_set_loaded_once_per_request(self):
+        """Повторные проверки в запросе не ходят ни в базу, ни в кэш."""
+        request = self.request(self.reader)
+        self.assertEqual(following_ids(request), {self.author.pk})
+        following_cache().clear()
+        with self.assertNumQueries(0):
+            self.assertIn(self.author.pk, following_ids(request))
+            self.assertNotIn(self.other.pk, following_ids(request))
+
+    def test_set_cached_between_requests(self):
+        """Следующий запрос берёт множество из кэша."""
+        following_ids(self.request(self.reader))
+        with self.assertNumQueries(0):
+            ids = following_ids(self.request(self.reader))
+        self.assertEqual(ids, {self.author.pk})
+
+    def test_follow_and_unfollow_reset_cache(self):
+        """Подписка и отписка сбрасывают закэшированное множество."""
+        following_ids(self.request(self.reader))
+        Follow.objects.create(user=self.reader, author=self.other)
+        self.assertIsNone(
+            following_cache().get(following_cache_key(self.reader.pk))
+        )
+        self.assertEqual(following_ids(self.request(self.reader)),
+                         {self.author.pk, self.other.pk})
+        Follow.objects.filter(user=self.reader, author=self.author).delete()
+        self.assertEqual(following_ids(self.request(self.reader)),
+                         {self.other.pk})
+
+    def test_anonymous_follows_nobody(self):
+        """У анонима пустое множество без запросов к базе."""
+        self.client.logout()
+        response = self.client.get('/')
+        with self.assertNumQueries(0):
+            following = response.context['following']
+            self.assertEqual(len(following), 0)
+
+    def test_profile_uses_cached_set(self):
+        """Профиль показывает подписку по множеству из кэша."""
+        url = reverse('profile', args=[self.author.username])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertTrue(response.context['follow_mark'])
+        self.assertContains(
+            response, reverse('profile_unfollow', args=[self.author.username])
+        )
+        self.assertEqual(self.follow_queries(queries), [])
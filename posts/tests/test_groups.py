@@ -0,0 +1,107 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Group, GroupSummary, Post
+from posts.outbox import consume
+from yatube.settings import POSTS_ON_PAGE
+
+User = get_user_model()
+
+
+class GroupSummaryTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='Sasha')
+        self.group = Group.objects.create(
+            title='Бизнес', slug='business', description='Офферы'
+        )
+        self.other = Group.objects.create(
+            title='Кино', slug='cinema', description='Фильмы'
+        )
+        self.client = Client()
+
+    def summary(self, group):
+        consume('group_summaries')
+        return GroupSummary.objects.get(group=group)
+
+    def test_summary_follows_writes(self):
+        """Сводка обновляется при создании, переносе и удалении постов."""
+        post = Post.objects.create(text='Пост', author=self.author,
+                                   group=self.group)
+        self.assertEqual(self.summary(self.group).posts_count, 1)
+        comment = Comment.objects.create(post=post, author=self.author,
+                                         text='Коммент')
+        self.assertEqual(self.summary(self.group).last_activity,
+                         comment.created)
+        post.group = self.other
+        post.save()
+        self.assertEqual(self.summary(self.group).posts_count, 0)
+        self.assertEqual(self.summary(self.other).posts_count, 1)
+        post.delete()
+        self.assertEqual(self.summary(self.other).posts_count, 0)
+        self.assertEqual(self.summary(self.other).first_page, '[]')
+
+    def test_directory_lists_groups(self):
+        """Каталог показывает группы с числом постов."""
+        Post.objects.create(text='Пост', author=self.author,
+                            group=self.group)
+        consume('group_summaries')
+        response = self.client.get(reverse('group_index'))
+        summaries = list(response.context['summaries'])
+        self.assertEqual([summary.group for summary in summaries],
+                         [self.group, self.other])
+        self.assertContains(response, 'Записей: 1')
+
+    def test_first_page_without_count(self):
+        """Первая страница группы собирается по сводке."""
+        posts = [
+            Post.objects.create(text=f'Пост {number}', author=self.author,
+                                group=self.group)
+            for number in range(POSTS_ON_PAGE + 2)
+        ]
+        consume('group_summaries')
+        url = reverse('group', args=[self.group.slug])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'SELECT COUNT(' in query['sql']
+        ])
+        page = response.context['page']
+        self.assertEqual(list(page), posts[::-1][:POSTS_ON_PAGE])
+        self.assertEqual(page.paginator.num_pages, 2)
+        second = self.client.get(url, {'page': 2}).context['page']
+        self.assertEqual(list(second), posts[1::-1])
+
+    def test_post_write_skips_count(self):
+        """Новый пост сдвигает счётчик группы без COUNT."""
+        Post.objects.create(text='Пост', author=self.author,
+                            group=self.group)
+        consume('group_summaries')
+        with CaptureQueriesContext(connection) as queries:
+            post = Post.objects.create(text='Ещё пост', author=self.author,
+                                       group=self.group)
+            consume('group_summaries')
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ])
+        summary = self.summary(self.group)
+        self.assertEqual(summary.posts_count, 2)
+        self.assertEqual(json.loads(summary.first_page)[0], post.id)
+
+    def test_stale_summary_falls_back_to_paginator(self):
+        """Пока потребитель не учёл новый пост, страница группы строится
+        обычной пагинацией и уже содержит этот пост."""
+        Post.objects.create(text='Старый', author=self.author,
+                            group=self.group)
+        consume('group_summaries')
+        post = Post.objects.create(text='Новый', author=self.author,
+                                   group=self.group)
+        response = self.client.get(reverse('group', args=[self.group.slug]))
+        self.assertEqual(response.context['page'][0], post)
+        self.assertEqual(response.context['page'].paginator.count, 2)
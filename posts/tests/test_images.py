@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from posts.models import Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def red_image():
+    buffer = BytesIO()
+    Image.new('RGB', (96, 58), (200, 10, 10)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name='red.png', content=buffer.getvalue(),
+                              content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ImagePreviewTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='Sasha')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_preview_computed_on_upload(self):
+        """При загрузке поста вычисляются цвет и заглушка."""
+        self.authorized_client.post(
+            reverse('new_post'), {'text': 'Пост', 'image': red_image()}
+        )
+        post = Post.objects.get()
+        self.assertEqual(post.image_color, '#c80a0a')
+        self.assertTrue(
+            post.image_placeholder.startswith('data:image/jpeg;base64,')
+        )
+        self.assertLess(len(post.image_placeholder), 1500)
+
+    def test_feed_image_is_lazy_with_size(self):
+        """В ленте изображение ленивое, с размерами и заглушкой."""
+        post = Post.objects.create(text='Пост', author=self.user,
+                                   image=red_image())
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'loading="lazy"')
+        self.assertContains(response, 'width="960" height="580"')
+        self.assertContains(response, post.image_color)
+
+    def test_fill_previews_for_old_posts(self):
+        """Команда досчитывает заглушки постов, загруженных раньше."""
+        post = Post.objects.create(text='Пост', author=self.user,
+                                   image=red_image())
+        Post.objects.update(image_color='', image_placeholder='')
+        updated = Post.objects.get(pk=post.pk).updated
+        call_command('fill_image_previews', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.image_color, '#c80a0a')
+        self.assertGreater(post.updated, updated)
@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse, set_script_prefix
+
+from posts.links import build
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class LinksTest(TestCase):
+    def test_build_matches_reverse(self):
+        """Собранный по шаблону адрес совпадает с reverse."""
+        for name, args in (
+            ('profile', ['user.name+tag@mail']),
+            ('group', ['cats-and_dogs']),
+            ('post', ['Саша', 42]),
+            ('post_edit', ['a b', 7]),
+            ('add_comment', ['user', 1]),
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(build(name, *args), reverse(name, args=args))
+
+    def test_script_prefix_respected(self):
+        """Адрес строится с текущим префиксом, а не с первым увиденным."""
+        build('group', 'cinema')
+        try:
+            set_script_prefix('/blog/')
+            self.assertEqual(build('group', 'cinema'), '/blog/group/cinema/')
+        finally:
+            set_script_prefix('/')
+        self.assertEqual(build('group', 'cinema'), '/group/cinema/')
+
+    def test_model_urls(self):
+        """Модели отдают адреса своих страниц."""
+        author = User.objects.create_user(username='Sasha')
+        group = Group.objects.create(title='Кино', slug='cinema',
+                                     description='Фильмы')
+        post = Post.objects.create(text='Пост', author=author, group=group)
+        self.assertEqual(author.get_absolute_url(),
+                         reverse('profile', args=['Sasha']))
+        self.assertEqual(group.get_absolute_url(),
+                         reverse('group', args=['cinema']))
+        self.assertEqual(post.get_absolute_url(),
+                         reverse('post', args=['Sasha', post.id]))
+        self.assertEqual(post.get_edit_url(),
+                         reverse('post_edit', args=['Sasha', post.id]))
+
+    def test_bench_render(self):
+        """Бенчмарк рендеринга не оставляет данных в БД."""
+        output = StringIO()
+        call_command('bench_render', posts=5, rounds=1, stdout=output)
+        self.assertIn('Экономия', output.getvalue())
+        self.assertFalse(Post.objects.exists())
@@ -1,6 +1,12 @@
+import json
+from io import StringIO
+
+from django.core import serializers
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
 
-from posts.models import Group, Post, User
+from posts.models import Group, GroupSummary, OutboxEvent, Post, User
 
 
 class TaskModelTest(TestCase):
@@ -85,3 +91,57 @@ class TaskModelTest(TestCase):
         post_text = self.post.text[:15]
         expected_object_name = f'Автор: {post_author} Текст: {post_text}'
         self.assertEquals(str(self.post), expected_object_name)
+
+    def test_fixture_post_without_updated_loads(self):
+        """Пост из старой фикстуры без поля updated загружается."""
+        fixture = json.dumps([{
+            'model': 'posts.post',
+            'pk': 1000,
+            'fields': {
+                'text': 'Из фикстуры',
+                'pub_date': '2020-01-01T00:00:00Z',
+                'author': self.post.author_id,
+                'group': None,
+            },
+        }])
+        for obj in serializers.deserialize('json', fixture):
+            obj.save()
+        self.assertIsNotNone(Post.objects.get(pk=1000).updated)
+
+    def test_fixture_comment_before_post_loads(self):
+        """Комментарий из фикстуры раньше своего поста загружается без
+        выводимых данных; сводку группы пересчитывает команда."""
+        fixture = json.dumps([{
+            'model': 'posts.comment',
+            'pk': 1000,
+            'fields': {
+                'post': 1000,
+                'author': self.post.author_id,
+                'text': 'Комментарий',
+                'created': '2020-01-02T00:00:00Z',
+            },
+        }, {
+            'model': 'posts.post',
+            'pk': 1000,
+            'fields': {
+                'text': 'Из фикстуры',
+                'pub_date': '2020-01-01T00:00:00Z',
+                'author': self.post.author_id,
+                'group': self.group.pk,
+            },
+        }])
+        events = OutboxEvent.objects.count()
+        with connection.constraint_checks_disabled():
+            for obj in serializers.deserialize('json', fixture):
+                obj.save()
+        self.assertEqual(OutboxEvent.objects.count(), events)
+        call_command('rebuild_summaries', stdout=StringIO())
+        summary = GroupSummary.objects.get(group=self.group)
+        self.assertEqual(summary.posts_count,
+                         Post.objects.filter(group=self.group).count())
+
+    def test_save_moves_updated(self):
+        """Сохранение поста сдвигает время изменения."""
+        updated = self.post.updated
+        self.post.save()
+        self.assertGreater(self.post.updated, updated)
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Follow, Post
+
+User = get_user_model()
+
+
+class FollowUpdatesTest(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.author = User.objects.create_user(username='Sasha')
+        self.other = User.objects.create_user(username='Pasha')
+        self.follower = User.objects.create_user(username='Masha')
+        Follow.objects.create(user=self.follower, author=self.author)
+        self.client = Client()
+        self.client.force_login(self.follower)
+
+    def poll_url(self):
+        since = self.client.get(reverse('follow_index')).context['since']
+        return f"{reverse('follow_updates')}?since={since}"
+
+    def test_new_posts_counted_for_follower(self):
+        """Опрос считает только новые посты любимых авторов."""
+        url = self.poll_url()
+        self.assertEqual(self.client.get(url).json(), {'count': 0})
+        Post.objects.create(text='Новый пост', author=self.author)
+        Post.objects.create(text='Чужой пост', author=self.other)
+        self.assertEqual(self.client.get(url).json(), {'count': 1})
+
+    def test_count_is_one_indexed_query(self):
+        """Старые посты не считаются, а счёт — один запрос к постам."""
+        Post.objects.create(text='Старый пост', author=self.author)
+        url = self.poll_url()
+        Post.objects.create(text='Новый пост', author=self.author)
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.json(), {'count': 1})
+
+    def test_unchanged_poll_not_modified(self):
+        """Пока авторы ничего не публикуют, опрос получает 304."""
+        url = self.poll_url()
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Post.objects.create(text='Новый пост', author=self.author)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,78 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Follow, OutboxEvent, Post
+from posts.outbox import consume, consumer, replay
+
+User = get_user_model()
+
+DELIVERED = []
+
+WRITE = re.compile(r'(?:INSERT INTO|UPDATE|DELETE FROM) "(\w+)"')
+
+
+@consumer('test_feed')
+def collect(events):
+    DELIVERED.append([(event.topic, event.action) for event in events])
+
+
+class OutboxTest(TestCase):
+    def setUp(self):
+        DELIVERED.clear()
+        self.author = User.objects.create_user(username='Sasha')
+        self.user = User.objects.create_user(username='Masha')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_views_write_events(self):
+        """Запись через представления попадает в журнал событий."""
+        self.authorized_client.post(reverse('new_post'), {'text': 'Пост'})
+        post = Post.objects.get(text='Пост')
+        self.authorized_client.post(
+            reverse('add_comment', args=[self.user.username, post.id]),
+            {'text': 'Комментарий'}
+        )
+        self.authorized_client.get(
+            reverse('profile_follow', args=[self.author.username])
+        )
+        self.authorized_client.get(
+            reverse('profile_unfollow', args=[self.author.username])
+        )
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list('topic', 'action')),
+            [('post', 'created'), ('comment', 'created'),
+             ('follow', 'created'), ('follow', 'deleted')]
+        )
+
+    def test_consume_in_batches_with_checkpoint(self):
+        """Потребитель получает события по порядку и не получает дважды."""
+        post = Post.objects.create(text='Пост', author=self.author)
+        Follow.objects.create(user=self.user, author=self.author)
+        post.delete()
+        self.assertEqual(consume('test_feed', batch_size=2), 3)
+        self.assertEqual(DELIVERED, [
+            [('post', 'created'), ('follow', 'created')],
+            [('post', 'deleted')],
+        ])
+        self.assertEqual(consume('test_feed'), 0)
+        replay('test_feed')
+        self.assertEqual(consume('test_feed'), 3)
+
+    def test_comment_writes_row_and_event(self):
+        """Комментарий пишет только свою строку и одно событие журнала."""
+        post = Post.objects.create(text='Пост', author=self.author)
+        url = reverse('add_comment', args=[self.author.username, post.id])
+        with CaptureQueriesContext(connection) as queries:
+            self.authorized_client.post(url, {'text': 'Комментарий'})
+        writes = [
+            match.group(1) for match in (
+                WRITE.match(query['sql'])
+                for query in queries.captured_queries
+            ) if match
+        ]
+        self.assertEqual(writes, ['posts_comment', 'posts_outboxevent'])
@@ -0,0 +1,108 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from posts.pagination import NoCountPaginator, elided_page_range
+from posts.prefetch import run_in_background
+from posts.templatetags.post_cards import card_key
+from yatube.settings import POSTS_ON_PAGE
+
+User = get_user_model()
+
+
+class PaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='Sasha')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.author)
+            for number in range(POSTS_ON_PAGE * 8 + 1)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_elided_page_range(self):
+        """Навигация — края и окно вокруг текущей страницы."""
+        paginator = Paginator(range(1000), 10)
+        self.assertEqual(elided_page_range(paginator.page(50)),
+                         [1, None, 48, 49, 50, 51, 52, None, 100])
+        self.assertEqual(elided_page_range(paginator.page(1)),
+                         [1, 2, 3, None, 100])
+        self.assertEqual(elided_page_range(paginator.page(97)),
+                         [1, None, 95, 96, 97, 98, 99, 100])
+        self.assertEqual(elided_page_range(Paginator(range(50), 10).page(3)),
+                         [1, 2, 3, 4, 5])
+
+    def test_index_renders_bounded_navigation(self):
+        """Главная не выводит ссылку на каждую страницу."""
+        response = self.client.get(reverse('index'))
+        self.assertEqual(response.context['page_range'],
+                         [1, 2, 3, None, 9])
+        self.assertNotContains(response, '?page=5"')
+        self.assertContains(response, '?page=9"')
+
+    def test_no_count_paginator(self):
+        """Без COUNT следующая страница определяется лишней строкой."""
+        paginator = NoCountPaginator(Post.objects.all(), POSTS_ON_PAGE)
+        with self.assertNumQueries(1):
+            page = paginator.get_page(2)
+        self.assertEqual(len(page), POSTS_ON_PAGE)
+        self.assertTrue(page.has_next())
+        last = paginator.get_page(9)
+        self.assertEqual(len(last), 1)
+        self.assertFalse(last.has_next())
+        self.assertEqual(paginator.get_page('abc').number, 1)
+
+    def test_api_no_count_mode(self):
+        """API в режиме nocount не отдаёт общее число постов."""
+        response = self.client.get(reverse('api_index'), {'nocount': '1'})
+        data = response.json()
+        self.assertIsNone(data['count'])
+        self.assertIsNone(data['num_pages'])
+        self.assertTrue(data['has_next'])
+        self.assertEqual(len(data['results']), POSTS_ON_PAGE)
+
+    def test_client_page_size_is_bounded(self):
+        """Размер страницы от клиента ограничен сверху и снизу."""
+        for per_page, expected in (('25', 25), ('1000', 50), ('0', 1),
+                                   ('abc', POSTS_ON_PAGE)):
+            with self.subTest(per_page=per_page):
+                response = self.client.get(reverse('api_index'),
+                                           {'per_page': per_page})
+                self.assertEqual(len(response.json()['results']), expected)
+
+    def test_navigation_keeps_query(self):
+        """Ссылки навигации сохраняют размер страницы."""
+        response = self.client.get(reverse('index'), {'per_page': 20})
+        self.assertEqual(len(response.context['page']), 20)
+        self.assertContains(response, '?per_page=20&amp;page=2"')
+
+    @override_settings(PREFETCH_NEXT_PAGE=True)
+    def test_next_page_cards_warmed(self):
+        """После ответа карточки следующей страницы уже в кэше."""
+        with mock.patch('posts.prefetch.run_in_background',
+                        lambda function: function()):
+            self.client.get(reverse('profile', args=[self.author.username]))
+        second = Post.objects.all()[POSTS_ON_PAGE:POSTS_ON_PAGE * 2]
+        self.assertTrue(all(cache.get(card_key(post)) for post in second))
+        third = Post.objects.all()[POSTS_ON_PAGE * 2]
+        self.assertIsNone(cache.get(card_key(third)))
+
+    def test_background_queue_bounded(self):
+        """При полной очереди прогрев пропускается, а не копится."""
+        release = threading.Event()
+        calls = []
+        with mock.patch('posts.prefetch.slots',
+                        threading.BoundedSemaphore(1)):
+            self.assertTrue(run_in_background(release.wait))
+            self.assertFalse(run_in_background(calls.append, 1))
+            release.set()
+        self.assertEqual(calls, [])
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class PostCardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Sasha')
+        self.reader = User.objects.create_user(username='Masha')
+        self.post = Post.objects.create(text='Пост', author=self.author)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.url = reverse('profile', args=[self.author.username])
+        self.edit_url = reverse('post_edit',
+                                args=[self.author.username, self.post.id])
+
+    def test_edit_button_not_cached(self):
+        """Кнопка правки видна только автору и не попадает в кэш."""
+        self.assertContains(self.author_client.get(self.url), self.edit_url)
+        self.assertNotContains(self.reader_client.get(self.url),
+                               self.edit_url)
+
+    def test_cards_skip_comment_queries(self):
+        """Число комментариев приходит с выборкой ленты, а не по запросу
+        на карточку."""
+        Comment.objects.create(post=self.post, author=self.reader,
+                               text='Коммент')
+        with CaptureQueriesContext(connection) as cold:
+            self.reader_client.get(self.url)
+        with CaptureQueriesContext(connection) as warm:
+            response = self.reader_client.get(self.url)
+        comment_queries = [
+            [query for query in queries
+             if 'FROM "posts_comment" WHERE' in query['sql']]
+            for queries in (cold, warm)
+        ]
+        self.assertEqual([len(found) for found in comment_queries], [0, 0])
+        self.assertContains(response, 'Комментариев: 1')
+
+    def test_comment_and_username_change_refresh_card(self):
+        """Комментарий и смена имени автора обновляют карточку."""
+        self.reader_client.get(self.url)
+        Comment.objects.create(post=self.post, author=self.reader,
+                               text='Коммент')
+        self.assertContains(self.reader_client.get(self.url),
+                            'Комментариев: 1')
+        self.author.username = 'Alexander'
+        self.author.save()
+        response = self.reader_client.get(
+            reverse('profile', args=['Alexander'])
+        )
+        self.assertContains(response, '@Alexander')
+
+    def test_group_rename_refreshes_card(self):
+        """Новое название и адрес группы сразу видны на карточке."""
+        group = Group.objects.create(title='Коты', slug='cats',
+                                     description='Про котов')
+        self.post.group = group
+        self.post.save()
+        self.reader_client.get(self.url)
+        group.title = 'Кошки'
+        group.slug = 'kitties'
+        group.save()
+        response = self.reader_client.get(self.url)
+        self.assertContains(response, '#Кошки')
+        self.assertContains(response, reverse('group', args=['kitties']))
+
+    def test_hidden_user_fields_keep_cards(self):
+        """Пароль и время входа автора не сбрасывают его карточки."""
+        updated = Post.objects.get(pk=self.post.pk).updated
+        self.author.set_password('secret-password')
+        self.author.save()
+        self.author.save(update_fields=['last_login'])
+        self.assertEqual(Post.objects.get(pk=self.post.pk).updated, updated)
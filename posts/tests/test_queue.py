@@ -0,0 +1,57 @@
+from django.test import TestCase, override_settings
+
+from posts.models import Task
+from posts.queue import enqueue, run_pending, task
+
+CALLS = []
+
+
+@task('test_single')
+def single(value):
+    if value == 'boom':
+        raise ValueError(value)
+    CALLS.append(value)
+
+
+@task('test_batch', batch=True)
+def batch(payloads):
+    CALLS.append([payload['value'] for payload in payloads])
+
+
+@override_settings(TASKS_MAX_ATTEMPTS=2, TASKS_RETRY_DELAY=0)
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_idempotency_key(self):
+        """Задача с тем же ключом ставится в очередь один раз."""
+        enqueue('test_single', {'value': 1}, key='once')
+        enqueue('test_single', {'value': 1}, key='once')
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(CALLS, [1])
+        self.assertEqual(run_pending(), 0)
+
+    def test_batch_handler(self):
+        """Пакетный обработчик получает все задачи своего имени разом."""
+        for value in range(3):
+            enqueue('test_batch', {'value': value})
+        run_pending()
+        self.assertEqual(CALLS, [[0, 1, 2]])
+        self.assertFalse(Task.objects.exclude(status=Task.DONE).exists())
+
+    def test_retries_then_fails(self):
+        """Упавшая задача повторяется и после лимита попыток помечается."""
+        failing = enqueue('test_single', {'value': 'boom'})
+        run_pending()
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, Task.PENDING)
+        self.assertIn('ValueError', failing.last_error)
+        run_pending()
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, Task.FAILED)
+        self.assertEqual(failing.attempts, 2)
+
+    def test_delayed_task_waits(self):
+        """Отложенная задача не выполняется раньше срока."""
+        enqueue('test_single', {'value': 2}, delay=60)
+        self.assertEqual(run_pending(), 0)
@@ -0,0 +1,137 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post
+from yatube.ratelimit import hit, rate_limit_cache
+
+User = get_user_model()
+
+
+@override_settings(RATE_LIMITS={'add_comment': (2, 60),
+                                'profile_follow': (1, 60),
+                                'signup': (1, 60 * 60)},
+                   RATE_LIMIT_IP_FACTOR=2)
+class RateLimitTest(TestCase):
+    def setUp(self):
+        rate_limit_cache().clear()
+        self.user = User.objects.create_user(username='Sasha')
+        self.post = Post.objects.create(text='Пост', author=self.user)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def comment(self):
+        return self.authorized_client.post(
+            reverse('add_comment', args=[self.user.username, self.post.id]),
+            {'text': 'Коммент'}
+        )
+
+    def test_over_budget_rejected(self):
+        """Сверх бюджета представление отвечает 429, не сохраняя данных."""
+        self.comment()
+        self.comment()
+        response = self.comment()
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(int(response['Retry-After']) > 0)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_budget_per_user(self):
+        """Бюджет одного пользователя не расходует бюджет другого."""
+        self.comment()
+        self.comment()
+        other = User.objects.create_user(username='Masha')
+        client = Client()
+        client.force_login(other)
+        response = client.post(
+            reverse('add_comment', args=[self.user.username, self.post.id]),
+            {'text': 'Коммент'}
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_accounts_share_ip_budget(self):
+        """Несколько аккаунтов с одного IP не обходят лимит адреса."""
+        self.comment()
+        self.comment()
+        responses = []
+        for username in ('Masha', 'Pasha', 'Dasha'):
+            client = Client()
+            client.force_login(User.objects.create_user(username=username))
+            responses.append(client.post(
+                reverse('add_comment',
+                        args=[self.user.username, self.post.id]),
+                {'text': 'Коммент'}
+            ).status_code)
+        self.assertEqual(responses, [302, 302, 429])
+
+    def test_unfollow_limited(self):
+        """Отписка расходует тот же бюджет, что и подписка."""
+        author = User.objects.create_user(username='Masha')
+        self.authorized_client.get(
+            reverse('profile_follow', args=[author.username])
+        )
+        response = self.authorized_client.get(
+            reverse('profile_unfollow', args=[author.username])
+        )
+        self.assertEqual(response.status_code, 429)
+
+    def test_signup_limited_by_ip_for_post_only(self):
+        """Регистрация ограничена по IP, показ формы не учитывается."""
+        client = Client()
+        client.get(reverse('signup'))
+        client.get(reverse('signup'))
+        client.post(reverse('signup'), {'username': 'first'})
+        response = client.post(reverse('signup'), {'username': 'second'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_bucket_refills_over_period(self):
+        """Ведро наполняется равномерно и не больше, чем на ``limit``."""
+        keys = [('test', 2)]
+        with mock.patch('yatube.ratelimit.time.time', return_value=600):
+            self.assertEqual(hit(keys, 60), 0)
+            self.assertEqual(hit(keys, 60), 0)
+            self.assertEqual(hit(keys, 60), 30)
+        with mock.patch('yatube.ratelimit.time.time', return_value=615):
+            self.assertEqual(hit(keys, 60), 15)
+            self.assertEqual(hit(keys, 60), 15)
+        # Отклонённые попытки жетонов не взяли: через полпериода в
+        # ведре снова жетон.
+        with mock.patch('yatube.ratelimit.time.time', return_value=630):
+            self.assertEqual(hit(keys, 60), 0)
+            self.assertEqual(hit(keys, 60), 30)
+        with mock.patch('yatube.ratelimit.time.time', return_value=1000):
+            self.assertEqual(hit(keys, 60), 0)
+            self.assertEqual(hit(keys, 60), 0)
+            self.assertEqual(hit(keys, 60), 30)
+
+    def test_limited_request_skips_database(self):
+        """Отказ по лимиту не обращается к базе данных."""
+        self.comment()
+        self.comment()
+        with self.assertNumQueries(0):
+            response = self.comment()
+        self.assertEqual(response.status_code, 429)
+
+    def test_rejected_key_leaves_other_untouched(self):
+        """Если один ключ вне лимита, второй не расходуется."""
+        with mock.patch('yatube.ratelimit.time.time', return_value=10):
+            self.assertEqual(hit([('full', 1)], 60), 0)
+            self.assertEqual(hit([('fresh', 1), ('full', 1)], 60), 60)
+            self.assertEqual(hit([('fresh', 1)], 60), 0)
+
+    def test_concurrent_hits_respect_limit(self):
+        """Одновременные запросы берут ровно ``limit`` жетонов."""
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(hit([('burst', 5)], 60))
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(0), 5)
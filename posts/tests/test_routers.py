@@ -0,0 +1,115 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+from yatube.routers import PRIMARY_COOKIE
+
+User = get_user_model()
+
+REPLICA = 'replica'
+SYNCED_MODELS = (User, Group, Post, Comment, Follow)
+
+
+def sync_replica():
+    """Переносит строки моделей из основной базы в файловую реплику.
+
+    Сессии не переносятся: роутер всегда читает их из основной базы.
+    """
+    for model in SYNCED_MODELS:
+        model.objects.using(REPLICA).all().delete()
+    for model in SYNCED_MODELS:
+        model.objects.using(REPLICA).bulk_create(
+            model.objects.using('default').all()
+        )
+
+
+@override_settings(REPLICA_DATABASES=[REPLICA])
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.replica_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        connections.databases[REPLICA] = dict(
+            settings.DATABASES['default'],
+            NAME=cls.replica_path,
+            TEST={'NAME': cls.replica_path},
+        )
+        call_command('migrate', database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+        os.remove(cls.replica_path)
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Sasha')
+        self.post = Post.objects.create(text='Текст', author=self.author)
+        self.post_url = reverse('post', args=[self.author.username,
+                                              self.post.id])
+        self.guest_client = Client()
+
+    def test_read_views_use_replica(self):
+        """Страница поста читается из реплики."""
+        response = self.guest_client.get(self.post_url)
+        self.assertEqual(response.status_code, 404)
+        sync_replica()
+        response = self.guest_client.get(self.post_url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_session_and_user_read_from_primary(self):
+        """Пользователь, которого ещё нет в реплике, остаётся в аккаунте."""
+        sync_replica()
+        reader = User.objects.create_user(username='Masha')
+        authorized_client = Client()
+        authorized_client.force_login(reader)
+        response = authorized_client.get(self.post_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'], reader)
+
+    def test_reads_do_not_stick_to_primary(self):
+        """Страница, прочитанная из реплики, не закрепляет клиента за
+        основной базой, хотя сессия читается из основной."""
+        sync_replica()
+        authorized_client = Client()
+        authorized_client.force_login(self.author)
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = authorized_client.get(self.post_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica.captured_queries)
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = authorized_client.get(self.post_url)
+        self.assertTrue(replica.captured_queries)
+
+    def test_reads_stick_to_primary_after_write(self):
+        """После записи клиент читает из основной базы."""
+        sync_replica()
+        authorized_client = Client()
+        authorized_client.force_login(self.author)
+        response = authorized_client.post(
+            reverse('add_comment', args=[self.author.username,
+                                         self.post.id]),
+            {'text': 'Комментарий'},
+        )
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+        new_post = Post.objects.create(text='Новый', author=self.author)
+        response = authorized_client.get(
+            reverse('post', args=[self.author.username, new_post.id])
+        )
+        self.assertEqual(response.status_code, 200)
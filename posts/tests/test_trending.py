@@ -0,0 +1,144 @@
+import math
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Comment, Follow, OutboxEvent, Post, TrendingPost
+from posts.outbox import consume
+from posts.trending import (apply_boosts, apply_penalties, contribution,
+                            log_add, prune, top_posts)
+
+User = get_user_model()
+
+
+@override_settings(TRENDING_HALF_LIFE=3600)
+class TrendingTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='Sasha')
+        self.user = User.objects.create_user(username='Masha')
+        self.client = Client()
+
+    def test_decay_keeps_order_without_rescoring(self):
+        """Старый вклад весит вдвое меньше через период полураспада."""
+        now = timezone.now()
+        old = contribution(2.0, now - timedelta(hours=1))
+        fresh = contribution(1.0, now)
+        self.assertAlmostEqual(old, fresh)
+        self.assertAlmostEqual(log_add(fresh, fresh),
+                               contribution(2.0, now))
+
+    def test_comments_raise_post(self):
+        """Пост с комментариями обгоняет более новый пост без них."""
+        quiet = Post.objects.create(text='Тихий', author=self.author)
+        hot = Post.objects.create(text='Горячий', author=self.author)
+        Post.objects.filter(id=hot.id).update(
+            pub_date=timezone.now() - timedelta(days=1)
+        )
+        for number in range(3):
+            Comment.objects.create(post=hot, author=self.user,
+                                   text=f'Комментарий {number}')
+        consume('trending')
+        self.assertEqual(
+            list(TrendingPost.objects.values_list('post_id', flat=True)),
+            [hot.id, quiet.id]
+        )
+        response = self.client.get(reverse('trending'))
+        self.assertEqual(list(response.context['posts']), [hot, quiet])
+
+    def test_followers_weight(self):
+        """Пост автора с подписчиками весит больше поста без них."""
+        Follow.objects.create(user=self.user, author=self.author)
+        lonely = Post.objects.create(text='Одинокий', author=self.user)
+        followed = Post.objects.create(text='Читаемый', author=self.author)
+        OutboxEvent.objects.filter(topic='post').update(
+            created=timezone.now()
+        )
+        consume('trending')
+        scores = dict(TrendingPost.objects.values_list('post_id', 'score'))
+        self.assertGreater(scores[followed.id], scores[lonely.id])
+
+    def test_deleted_post_skipped(self):
+        """Удалённый до обработки пост не попадает в ленту."""
+        post = Post.objects.create(text='Пост', author=self.author)
+        post.delete()
+        consume('trending')
+        self.assertFalse(TrendingPost.objects.exists())
+
+    def test_top_n_is_single_query(self):
+        """Чтение ленты не агрегирует комментарии."""
+        for number in range(5):
+            post = Post.objects.create(text=f'Пост {number}',
+                                       author=self.author)
+            Comment.objects.create(post=post, author=self.user, text='!')
+        consume('trending')
+        with self.assertNumQueries(1):
+            posts = top_posts(3)
+        self.assertEqual(len(posts), 3)
+
+    def test_deleted_comment_and_unfollow_lower_score(self):
+        """Удалённый комментарий и отписка уменьшают рейтинг поста."""
+        post = Post.objects.create(text='Пост', author=self.author)
+        comment = Comment.objects.create(post=post, author=self.user,
+                                         text='Комментарий')
+        follow = Follow.objects.create(user=self.user, author=self.author)
+        consume('trending')
+        score = TrendingPost.objects.get(post=post).score
+        comment.delete()
+        consume('trending')
+        lowered = TrendingPost.objects.get(post=post).score
+        self.assertLess(lowered, score)
+        follow.delete()
+        consume('trending')
+        self.assertLess(TrendingPost.objects.get(post=post).score, lowered)
+
+    def test_unfollow_removes_exact_follow_boost(self):
+        """Отписка вычитает вклад подписки из поднятого ею поста, даже
+        если с тех пор у автора появился новый пост."""
+        boosted = Post.objects.create(text='Пост', author=self.author)
+        consume('trending')
+        score = TrendingPost.objects.get(post=boosted).score
+        follow = Follow.objects.create(user=self.user, author=self.author)
+        newer = Post.objects.create(text='Новый пост', author=self.author)
+        consume('trending')
+        newer_score = TrendingPost.objects.get(post=newer).score
+        self.assertGreater(TrendingPost.objects.get(post=boosted).score,
+                           score)
+        follow.delete()
+        consume('trending')
+        self.assertAlmostEqual(TrendingPost.objects.get(post=boosted).score,
+                               score)
+        self.assertEqual(TrendingPost.objects.get(post=newer).score,
+                         newer_score)
+
+    def test_penalty_clamps_at_zero(self):
+        """Лишний вычет обнуляет вес поста, а не уводит его в минус."""
+        post = Post.objects.create(text='Пост', author=self.author)
+        consume('trending')
+        trending = TrendingPost.objects.get(post=post)
+        apply_penalties({post.id: [trending.score + 1]})
+        trending.refresh_from_db()
+        self.assertEqual(trending.score, -math.inf)
+        apply_boosts({post.id: [contribution(1.0, timezone.now())]})
+        trending.refresh_from_db()
+        self.assertAlmostEqual(trending.score,
+                               contribution(1.0, timezone.now()), places=3)
+
+    @override_settings(TRENDING_KEEP=2)
+    def test_table_keeps_top_posts(self):
+        """В таблице остаются только лучшие незатухшие посты."""
+        posts = [
+            Post.objects.create(text=f'Пост {number}', author=self.author)
+            for number in range(4)
+        ]
+        for post in posts[:2]:
+            Comment.objects.create(post=post, author=self.user, text='!')
+        consume('trending')
+        self.assertEqual(
+            set(TrendingPost.objects.values_list('post_id', flat=True)),
+            {posts[0].id, posts[1].id}
+        )
+        prune(timezone.now() + timedelta(days=30))
+        self.assertFalse(TrendingPost.objects.exists())
@@ -9,7 +9,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
-from posts.models import Follow, Group, Post
+from posts.models import Comment, Follow, Group, Post
 from yatube.settings import POSTS_ON_PAGE
 
 User = get_user_model()
@@ -200,6 +200,17 @@ class TaskPagesTests(TestCase):
             response_after_cleared_cache.content
         )
 
+    def test_cached_index_hides_author_actions(self):
+        """Кэш главной, собранный для автора, не показывает кнопки
+        правки анонимному посетителю."""
+        cache.clear()
+        edit_url = self.post.get_edit_url()
+        response = self.authorized_client_sasha.get(reverse('index'))
+        self.assertContains(response, edit_url)
+        response = self.client.get(reverse('index'))
+        self.assertNotContains(response, edit_url)
+        self.assertNotContains(response, 'Редактировать')
+
     def test_follow_process(self):
         """Работает ли подписка"""
         total_before_follow = Follow.objects.count()
@@ -235,3 +246,68 @@ class TaskPagesTests(TestCase):
         auth_new_user.force_login(new_user)
         response_new_user = auth_new_user.get(reverse('follow_index'))
         self.assertEqual(response_new_user.context['page'].paginator.count, 0)
+
+
+class ConditionalPagesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Sasha')
+        cls.group = Group.objects.create(
+            title='Бизнес',
+            slug='business',
+            description='Для публикации офферов',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый заголовок',
+            author=cls.author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='StasBasov')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_pages_answer_not_modified(self):
+        """Повторный запрос с If-None-Match получает 304."""
+        urls = [
+            reverse('index'),
+            reverse('group', args=[self.group.slug]),
+            reverse('profile', args=[self.author.username]),
+            reverse('post', args=[self.author.username, self.post.id]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                etag = self.authorized_client.get(url)['ETag']
+                response = self.authorized_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_data_and_user(self):
+        """ETag зависит от пользователя, постов и подписок."""
+        url = reverse('profile', args=[self.author.username])
+        etag = self.authorized_client.get(url)['ETag']
+        self.assertNotEqual(Client().get(url)['ETag'], etag)
+        Follow.objects.create(user=self.user, author=self.author)
+        self.assertNotEqual(self.authorized_client.get(url)['ETag'], etag)
+        etag = self.authorized_client.get(url)['ETag']
+        self.post.text = 'Отредактированный текст'
+        self.post.save()
+        self.assertNotEqual(self.authorized_client.get(url)['ETag'], etag)
+
+    def test_validators_skip_feed_queries(self):
+        """Проверка ETag группы не запрашивает посты и комментарии."""
+        url = reverse('group', args=[self.group.slug])
+        etag = self.authorized_client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(
+                url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        Comment.objects.create(post=self.post, author=self.user,
+                               text='Комментарий')
+        response = self.authorized_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,240 @@
+"""Инкрементальный рейтинг популярных постов.
+
+Каждое событие добавляет посту вес, который затухает вдвое за
+``TRENDING_HALF_LIFE`` секунд. Чтобы не пересчитывать затухание всех
+строк, рейтинг хранится в логарифмической шкале относительно начала
+эпохи: вклад события — ``log(вес) + t·ln2 / T½``, а сумма вкладов
+копится через logaddexp. Порядок по ``score`` совпадает с порядком по
+затухшему весу на любой момент, поэтому топ-N — это чтение N строк по
+индексу.
+
+Вес комментария и нового поста растёт с числом подписчиков автора,
+новая подписка поднимает последний пост автора. Событие подписки
+запоминает, какой пост она подняла и когда, поэтому удалённый
+комментарий и отписка вычитают ровно тот вклад, который когда-то
+добавили. Вес поста не опускается ниже нуля: если вычитать уже нечего,
+он обнуляется, и такую строку убирает ``prune``. После каждого
+пакета в таблице остаются ``TRENDING_KEEP`` лучших строк, затухший вес
+которых не меньше ``TRENDING_MIN_WEIGHT``. Перед повторным
+проигрыванием журнала таблицу ``TrendingPost`` нужно очистить.
+"""
+import json
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Follow, OutboxEvent, Post, TrendingPost
+from .outbox import consumer
+
+LN2 = math.log(2)
+
+
+def log_add(first, second):
+    high, low = max(first, second), min(first, second)
+    return high + math.log1p(math.exp(low - high))
+
+
+def log_sub(first, second):
+    """``log(e^first - e^second)``, не меньше ``log(0) = -inf``."""
+    if second >= first:
+        return -math.inf
+    return first + math.log1p(-math.exp(second - first))
+
+
+def contribution(weight, moment):
+    return math.log(weight) + (
+        moment.timestamp() * LN2 / settings.TRENDING_HALF_LIFE
+    )
+
+
+def follower_weights(author_ids):
+    counts = dict(
+        Follow.objects.filter(author_id__in=author_ids).values(
+            'author_id'
+        ).annotate(count=Count('id')).values_list('author_id', 'count')
+    )
+    return {
+        author_id: 1 + math.log1p(counts.get(author_id, 0))
+        for author_id in author_ids
+    }
+
+
+SCORED = {
+    ('created', 'post'), ('created', 'comment'), ('created', 'follow'),
+    ('deleted', 'comment'), ('deleted', 'follow'),
+}
+TOPIC_WEIGHTS = {
+    'post': 'TRENDING_POST_WEIGHT',
+    'comment': 'TRENDING_COMMENT_WEIGHT',
+    'follow': 'TRENDING_FOLLOW_WEIGHT',
+}
+
+
+def follow_payload(follow):
+    """Пост, который поднимает подписка, и её время для события журнала."""
+    return {
+        'post_id': Post.objects.filter(author_id=follow.author_id).order_by(
+            '-id'
+        ).values_list('id', flat=True).first(),
+        'created': timezone.now(),
+    }
+
+
+def follow_origins(events):
+    """Событие создания подписки для каждой отписки из ``events``."""
+    deleted = [
+        event for event in events
+        if event.topic == 'follow' and event.action == 'deleted'
+    ]
+    if not deleted:
+        return {}
+    created = defaultdict(list)
+    for origin in OutboxEvent.objects.filter(
+        topic='follow', action='created',
+        object_id__in={event.object_id for event in deleted},
+        id__lt=max(event.id for event in deleted),
+    ):
+        origin.data = json.loads(origin.payload)
+        created[origin.object_id].append(origin)
+    origins = {}
+    for event in deleted:
+        # id подписки может достаться новой подписке, поэтому берётся
+        # последнее создание перед этой отпиской.
+        earlier = [
+            origin for origin in created[event.object_id]
+            if origin.id < event.id
+        ]
+        if earlier:
+            origins[event.id] = max(earlier, key=lambda origin: origin.id)
+    return origins
+
+
+def event_moment(event):
+    """Момент вклада: время создания комментария или подписки, даже
+    если событие — их удаление."""
+    created = parse_datetime(event.data.get('created') or '')
+    if created is not None and event.topic != 'post':
+        return created
+    return event.created
+
+
+def follow_target(event, origins, latest_posts):
+    """Пост и событие, которые задают вклад подписки или отписки."""
+    if event.action == 'deleted':
+        event = origins.get(event.id)
+        if event is None:
+            return None, None
+    if 'post_id' in event.data:
+        return event.data['post_id'], event
+    # Подписки, загруженные без сигналов, поднимают последний пост автора
+    # на момент обработки.
+    return latest_posts.get(event.data['author_id']), event
+
+
+@consumer('trending')
+def update_scores(events):
+    scored = [
+        event for event in events if (event.action, event.topic) in SCORED
+    ]
+    origins = follow_origins(scored)
+    latest_posts = dict(Post.objects.filter(author_id__in={
+        event.data['author_id'] for event in scored
+        if event.topic == 'follow'
+    }).values('author_id').annotate(last=Max('id')).values_list(
+        'author_id', 'last'
+    ))
+    targets = []
+    for event in scored:
+        moment_event = event
+        if event.topic == 'follow':
+            post_id, moment_event = follow_target(event, origins,
+                                                  latest_posts)
+        else:
+            post_id = event.data.get('post_id', event.object_id)
+        if post_id is not None:
+            targets.append((event, post_id, event_moment(moment_event)))
+    post_authors = dict(Post.objects.filter(
+        id__in={post_id for _, post_id, _ in targets}
+    ).values_list('id', 'author_id'))
+    weights = follower_weights(set(post_authors.values()))
+
+    changes = {'created': defaultdict(list), 'deleted': defaultdict(list)}
+    for event, post_id, moment in targets:
+        if post_id not in post_authors:
+            continue
+        weight = getattr(settings, TOPIC_WEIGHTS[event.topic])
+        if event.topic != 'follow':
+            # Вес удалённого комментария — по нынешнему числу
+            # подписчиков автора.
+            weight *= weights[post_authors[post_id]]
+        changes[event.action][post_id].append(
+            contribution(weight, moment)
+        )
+    apply_boosts(changes['created'])
+    apply_penalties(changes['deleted'])
+    prune()
+
+
+def apply_boosts(boosts):
+    existing = TrendingPost.objects.in_bulk(list(boosts))
+    live = set(Post.objects.filter(id__in=list(boosts)).values_list(
+        'id', flat=True
+    ))
+    changed, new = [], []
+    for post_id, contributions in boosts.items():
+        if post_id not in live:
+            continue
+        trending = existing.get(post_id)
+        if trending is None:
+            trending = TrendingPost(post_id=post_id, score=contributions[0])
+            contributions = contributions[1:]
+            new.append(trending)
+        else:
+            changed.append(trending)
+        for value in contributions:
+            trending.score = log_add(trending.score, value)
+    TrendingPost.objects.bulk_update(changed, ['score'])
+    TrendingPost.objects.bulk_create(new)
+
+
+def apply_penalties(penalties):
+    existing = TrendingPost.objects.in_bulk(list(penalties))
+    changed = []
+    for post_id, contributions in penalties.items():
+        trending = existing.get(post_id)
+        if trending is None:
+            continue
+        for value in contributions:
+            trending.score = log_sub(trending.score, value)
+        changed.append(trending)
+    TrendingPost.objects.bulk_update(changed, ['score'])
+
+
+def prune(now=None):
+    """Оставляет ``TRENDING_KEEP`` лучших незатухших строк."""
+    threshold = contribution(settings.TRENDING_MIN_WEIGHT,
+                             now or timezone.now())
+    pruned = TrendingPost.objects.filter(score__lt=threshold).delete()[0]
+    cutoff = TrendingPost.objects.values_list('score', flat=True)[
+        settings.TRENDING_KEEP:settings.TRENDING_KEEP + 1
+    ]
+    if cutoff:
+        pruned += TrendingPost.objects.filter(
+            score__lte=cutoff[0]
+        ).delete()[0]
+    return pruned
+
+
+def top_posts(limit):
+    top = TrendingPost.objects.select_related(
+        'post__author', 'post__group'
+    ).annotate(comments_count=Count('post__comments'))[:limit]
+    posts = []
+    for trending in top:
+        trending.post.comments_count = trending.comments_count
+        posts.append(trending.post)
+    return posts
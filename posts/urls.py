@@ -1,8 +1,21 @@
-from django.urls import path
+from django.urls import include, path
 
-from . import views
+from . import api, views
+
+api_urlpatterns = [
+    path('posts/', api.index, name='api_index'),
+    path('group/<slug:slug>/', api.group_posts, name='api_group'),
+    path('follow/', api.follow_index, name='api_follow'),
+    path('users/<str:username>/', api.profile, name='api_profile'),
+    path(
+        'users/<str:username>/<int:post_id>/',
+        api.post_view,
+        name='api_post'
+    ),
+]
 
 urlpatterns = [
+    path('api/', include(api_urlpatterns)),
     path(
         '<username>/<int:post_id>/comment/',
         views.add_comment,
@@ -18,11 +31,29 @@ urlpatterns = [
         views.profile_follow,
         name='profile_follow'
     ),
+    path(
+        '<str:username>/export/',
+        views.profile_export,
+        name='profile_export'
+    ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('follow/updates/', views.follow_updates, name='follow_updates'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group'),
+    path(
+        'group/<slug:slug>/export/',
+        views.group_export,
+        name='group_export'
+    ),
     path('new/', views.new_post, name='new_post'),
+    path('trending/', views.trending, name='trending'),
     path('<str:username>/', views.profile, name='profile'),
     path('<str:username>/<int:post_id>/', views.post_view, name='post'),
+    path(
+        '<str:username>/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         '<str:username>/<int:post_id>/edit/',
         views.post_edit,
@@ -1,32 +1,87 @@
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import (HttpResponseBadRequest, JsonResponse,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render, reverse
 
+from posts.cdn import (INDEX_KEY, add_surrogate_keys, author_key,
+                       edge_cacheable, group_key, page_keys, post_keys)
+from posts.comments import comments_page
+from posts.conditional import (conditional_feed, follow_feed, group_feed,
+                               index_feed, post_page, profile_page,
+                               user_salt)
+from posts.export import CONTENT_TYPES, RENDERERS, group_rows, user_rows
+from posts.follows import following_ids
 from posts.forms import CommentForm, PostForm
-from posts.models import Follow, Group, Post, User
-from yatube.settings import POSTS_ON_PAGE
+from posts.groups import first_page
+from posts.models import Follow, Group, GroupSummary, Post, User
+from posts.notifications import latest_post_id, new_posts_count
+from posts.pagination import (default_page_size, make_paginator,
+                              page_context, page_size)
+from posts.prefetch import warm_next_page
+from posts.templatetags.post_cards import card_posts
+from posts.trending import top_posts
+from yatube.ratelimit import rate_limit
+from yatube.routers import replica_reads
+from yatube.settings import (COMMENTS_ON_PAGE, FOLLOW_POLL_SECONDS,
+                             INDEX_CACHE_TIMEOUT, TRENDING_SIZE)
 
 
+@replica_reads
+@edge_cacheable
+@conditional_feed(index_feed, salt=user_salt,
+                  cache_timeout=INDEX_CACHE_TIMEOUT)
 def index(request):
-    latest = Post.objects.all()
-    paginator = Paginator(latest, POSTS_ON_PAGE)
+    latest = card_posts(Post.objects.all())
+    paginator = make_paginator(request, latest, page_size(request, 'index'))
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
-    context = {'page': page}
-    return render(request, 'index.html', context)
+    context = {
+        **page_context(request, page),
+        'cache_timeout': INDEX_CACHE_TIMEOUT,
+    }
+    response = render(request, 'index.html', context)
+    warm_next_page(page)
+    return add_surrogate_keys(response, [INDEX_KEY] + page_keys(page))
 
 
+@replica_reads
+@edge_cacheable
+@conditional_feed(group_feed, salt=user_salt)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = Paginator(posts, POSTS_ON_PAGE)
+    group = get_object_or_404(Group.objects.select_related('summary'),
+                              slug=slug)
+    posts = card_posts(group.posts.all())
+    per_page = page_size(request, 'group')
     page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    context = {'page': page, 'group': group}
-    return render(request, 'group.html', context)
+    page = None
+    if page_number in (None, '', '1') and (
+            per_page == default_page_size('group')):
+        page = first_page(group, Paginator(posts, per_page))
+    if page is None:
+        paginator = make_paginator(request, posts, per_page)
+        page = paginator.get_page(page_number)
+    context = {**page_context(request, page), 'group': group}
+    response = render(request, 'group.html', context)
+    warm_next_page(page)
+    return add_surrogate_keys(
+        response, [group_key(group.slug)] + page_keys(page)
+    )
+
+
+@replica_reads
+def group_index(request):
+    summaries = GroupSummary.objects.select_related('group')
+    return render(request, 'groups.html', {'summaries': summaries})
 
 
 @login_required
+@rate_limit('new_post', methods=['POST'])
+@transaction.atomic
 def new_post(request):
     form = PostForm(
         request.POST or None,
@@ -41,39 +96,83 @@ def new_post(request):
     return render(request, 'new_post.html', context)
 
 
+def count_by_author(model):
+    counts = model.objects.filter(author=OuterRef('pk')).order_by().values(
+        'author'
+    ).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def get_author_card(request, username):
+    """Автор со всеми счётчиками карточки профиля за один запрос."""
+    authors = User.objects.annotate(
+        posts_count=count_by_author(Post),
+        followers_count=count_by_author(Follow),
+    )
+    return get_object_or_404(authors, username=username)
+
+
+@replica_reads
+@edge_cacheable
+@conditional_feed(profile_page, salt=user_salt)
 def profile(request, username):
-    username = get_object_or_404(User, username=username)
-    user = request.user
-    posts = username.posts.all()
-    paginator = Paginator(posts, POSTS_ON_PAGE)
+    username = get_author_card(request, username)
+    posts = card_posts(username.posts.all())
+    paginator = Paginator(posts, page_size(request, 'profile'))
+    paginator.count = username.posts_count
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
-    follow_mark = (user.is_authenticated
-                   and user.follower.filter(author=username).exists()
-                   )
     context = {
-        'page': page,
+        **page_context(request, page),
         'author': username,
-        'follow_mark': follow_mark
+        'follow_mark': username.pk in following_ids(request)
     }
-    return render(request, 'profile.html', context)
+    response = render(request, 'profile.html', context)
+    warm_next_page(page)
+    return add_surrogate_keys(
+        response, [author_key(username.id)] + page_keys(page)
+    )
 
 
+@replica_reads
+@edge_cacheable
+@conditional_feed(post_page, salt=user_salt)
 def post_view(request, username, post_id):
-    post = get_object_or_404(Post, author__username=username, id=post_id)
-    author = post.author
+    author = get_author_card(request, username)
+    post = get_object_or_404(
+        card_posts(Post.objects.all()), author=author, id=post_id
+    )
+    post.author = author
     form = CommentForm()
-    comments = post.comments.all()
+    comments, next_cursor = comments_page(post, None, COMMENTS_ON_PAGE)
     context = {
         'post': post,
         'author': author,
         'form': form,
         'comments': comments,
+        'next_cursor': next_cursor,
     }
-    return render(request, 'post.html', context)
+    response = render(request, 'post.html', context)
+    return add_surrogate_keys(response, post_keys(post))
+
+
+@replica_reads
+def post_comments(request, username, post_id):
+    post = get_object_or_404(Post, author__username=username, id=post_id)
+    comments, next_cursor = comments_page(
+        post, request.GET.get('cursor'), COMMENTS_ON_PAGE
+    )
+    context = {
+        'post': post,
+        'comments': comments,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'auxiliary/comment_list.html', context)
 
 
 @login_required
+@rate_limit('add_comment')
+@transaction.atomic
 def add_comment(request, username, post_id):
     post = get_object_or_404(Post, author__username=username, id=post_id)
     form = CommentForm(request.POST or None)
@@ -86,6 +185,7 @@ def add_comment(request, username, post_id):
 
 
 @login_required
+@transaction.atomic
 def post_edit(request, username, post_id):
     post = get_object_or_404(Post, author__username=username, id=post_id)
     if request.user != post.author:
@@ -115,18 +215,48 @@ def server_error(request):
     return render(request, 'misc/500.html', status=500)
 
 
+@replica_reads
 @login_required
 def follow_index(request):
     user = request.user
-    following_posts = Post.objects.filter(author__following__user=user)
-    paginator = Paginator(following_posts, POSTS_ON_PAGE)
+    following_posts = card_posts(
+        Post.objects.filter(author__following__user=user)
+    )
+    paginator = make_paginator(request, following_posts,
+                               page_size(request, 'follow'))
     page_number = request.GET.get('page')
     page = paginator.get_page(page_number)
-    context = {'page': page}
-    return render(request, 'follow.html', context)
+    context = {
+        **page_context(request, page),
+        'since': latest_post_id(),
+        'poll_seconds': FOLLOW_POLL_SECONDS,
+    }
+    response = render(request, 'follow.html', context)
+    warm_next_page(page)
+    return response
+
+
+@replica_reads
+def trending(request):
+    context = {'posts': top_posts(TRENDING_SIZE)}
+    return render(request, 'trending.html', context)
 
 
 @login_required
+@conditional_feed(follow_feed, salt=user_salt)
+def follow_updates(request):
+    try:
+        since = int(request.GET.get('since', 0))
+    except ValueError:
+        return HttpResponseBadRequest('since должен быть числом')
+    response = JsonResponse({'count': new_posts_count(request, since)})
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@login_required
+@rate_limit('profile_follow')
+@transaction.atomic
 def profile_follow(request, username):
     user = request.user
     following_author = get_object_or_404(User, username=username)
@@ -138,6 +268,8 @@ def profile_follow(request, username):
 
 
 @login_required
+@rate_limit('profile_follow')
+@transaction.atomic
 def profile_unfollow(request, username):
     unfollowing_author = get_object_or_404(User, username=username)
     unfollow = Follow.objects.filter(
@@ -145,3 +277,33 @@ def profile_unfollow(request, username):
     if unfollow.exists():
         unfollow.delete()
     return redirect('profile', username=username)
+
+
+def export_response(request, rows, filename):
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in RENDERERS:
+        return HttpResponseBadRequest('Неизвестный формат выгрузки')
+    response = StreamingHttpResponse(
+        RENDERERS[export_format](rows),
+        content_type=CONTENT_TYPES[export_format]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
+
+
+@login_required
+def profile_export(request, username):
+    author = get_object_or_404(User, username=username)
+    if request.user != author and not request.user.is_staff:
+        raise PermissionDenied
+    return export_response(request, user_rows(author), f'user_{author.pk}')
+
+
+@login_required
+def group_export(request, slug):
+    if not request.user.is_staff:
+        raise PermissionDenied
+    group = get_object_or_404(Group, slug=slug)
+    return export_response(request, group_rows(group), f'group_{group.slug}')
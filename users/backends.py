@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+USER_CACHE_KEY = 'auth_user:{}'
+
+
+def user_cache():
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который достаёт пользователя сессии из общего кэша."""
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = user_cache().get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                user_cache().set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, register
+
+CACHED_BACKEND = 'users.backends.CachedModelBackend'
+
+
+@register()
+def check_shared_caches(app_configs, **kwargs):
+    """Сессии и пользователи сессий не должны жить в кэше процесса.
+
+    Сброс такого кэша после смены пароля или блокировки виден только
+    процессу, который его выполнил, а остальные продолжают пускать
+    пользователя по устаревшей копии.
+    """
+    aliases = {}
+    if 'cache' in settings.SESSION_ENGINE:
+        aliases['SESSION_CACHE_ALIAS'] = settings.SESSION_CACHE_ALIAS
+    if CACHED_BACKEND in settings.AUTHENTICATION_BACKENDS:
+        aliases['USER_CACHE_ALIAS'] = settings.USER_CACHE_ALIAS
+    return [
+        Error(
+            f'{name} указывает на кэш процесса {alias!r}',
+            hint='Укажите кэш, общий для всех процессов: файловый, '
+                 'memcached или БД.',
+            id='users.E001',
+        )
+        for name, alias in aliases.items()
+        if isinstance(caches[alias], LocMemCache)
+    ]
@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from users.backends import user_cache, user_cache_key
+from users.checks import check_shared_caches
+
+User = get_user_model()
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+SHARED_CACHES = {
+    **LOCAL_CACHES,
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/nonexistent/shared_cache',
+    },
+}
+
+
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        user_cache().clear()
+        self.user = User.objects.create_user(username='Sasha')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_warm_cache_costs_no_queries(self):
+        """Сессия и пользователь берутся из кэша без запросов к БД."""
+        url = reverse('about:author')
+        self.authorized_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(url)
+        self.assertContains(response, self.user.username)
+
+    def test_user_save_invalidates_cache(self):
+        """Изменение пользователя сбрасывает закэшированный объект."""
+        self.authorized_client.get(reverse('about:author'))
+        self.assertIsNotNone(user_cache().get(user_cache_key(self.user.pk)))
+        self.user.first_name = 'Александр'
+        self.user.save()
+        self.assertIsNone(user_cache().get(user_cache_key(self.user.pk)))
+
+    def test_deactivated_user_logged_out(self):
+        """Заблокированный пользователь сразу теряет доступ."""
+        url = reverse('new_post')
+        self.assertEqual(self.authorized_client.get(url).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.authorized_client.get(url).status_code, 302)
+
+    def test_shared_cache_required(self):
+        """Проверка запуска не даёт держать сессии в кэше процесса."""
+        with override_settings(CACHES=SHARED_CACHES):
+            self.assertEqual(check_shared_caches(None), [])
+        with override_settings(CACHES=LOCAL_CACHES):
+            errors = check_shared_caches(None)
+        self.assertEqual(
+            {error.id for error in errors}, {'users.E001'}
+        )
+        self.assertEqual(len(errors), 2)
@@ -0,0 +1,43 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+Django 2.2 has no native ASGI handler, so the WSGI application is wrapped
+with the asgiref adapter. The stock adapter runs every request through
+thread-sensitive ``sync_to_async``, i.e. on one shared thread, so a single
+slow view would stall the whole worker. Here requests run in a pool of
+``ASGI_THREADS`` threads instead, while the ASGI server keeps slow
+clients and keep-alive connections on its event loop. Native async views
+need Django 3.1 or newer.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+executor = ThreadPoolExecutor(max_workers=settings.ASGI_THREADS,
+                              thread_name_prefix='asgi')
+
+
+class ThreadPoolWsgiToAsgiInstance(WsgiToAsgiInstance):
+    run_wsgi_app = sync_to_async(
+        WsgiToAsgiInstance.__dict__['run_wsgi_app'].func,
+        thread_sensitive=False,
+        executor=executor,
+    )
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        instance = ThreadPoolWsgiToAsgiInstance(self.wsgi_application)
+        await instance(scope, receive, send)
+
+
+application = ThreadPoolWsgiToAsgi(get_wsgi_application())
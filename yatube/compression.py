@@ -0,0 +1,188 @@
+"""Сжатие и минификация ответов.
+
+``MinifyHTMLMiddleware`` схлопывает отступы и переводы строк, которые
+оставляют вложенные шаблоны, в один пробел — браузер отображает такую
+разметку так же; значения атрибутов в кавычках и содержимое ``pre``,
+``textarea``, ``script`` и ``style`` не трогаются.
+``CompressionMiddleware`` сжимает ответы не короче ``COMPRESS_MIN_SIZE``
+байт: brotli, если установлен пакет ``brotli`` и клиент его принимает,
+иначе gzip. Ответы с CSRF-токеном не сжимаются: сжатие секрета рядом с
+данными из запроса открывает его атаке BREACH.
+
+Статику сжимает заранее команда ``compress_static``, а
+``serve_precompressed`` отдаёт готовые ``.br`` и ``.gz`` без сжатия на
+лету.
+"""
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+from django.views.static import serve
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BLOCK = re.compile(
+    r'(?P<preserved><(pre|textarea|script|style)\b.*?</\2\s*>)'
+    r'|(?P<tag><(?:"[^"]*"|\'[^\']*\'|[^\'">])*>)',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PART = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+WHITESPACE = re.compile(r'\s+')
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE = ('.css', '.js', '.map', '.svg', '.html', '.txt', '.json')
+
+
+def minify_tag(tag):
+    """Схлопывает пробелы между атрибутами, но не внутри их значений."""
+    return TAG_PART.sub(lambda part: part.group(1) or ' ', tag)
+
+
+def minify_html(html):
+    minified = []
+    position = 0
+    for match in BLOCK.finditer(html):
+        minified.append(WHITESPACE.sub(' ', html[position:match.start()]))
+        block = match.group()
+        minified.append(minify_tag(block) if match.group('tag') else block)
+        position = match.end()
+    minified.append(WHITESPACE.sub(' ', html[position:]))
+    return ''.join(minified).strip()
+
+
+class MinifyHTMLMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.MINIFY_HTML
+            and not response.streaming
+            and not response.has_header('Content-Encoding')
+            and response.get('Content-Type', '').startswith('text/html')
+        ):
+            charset = response.charset
+            response.content = minify_html(
+                response.content.decode(charset)
+            ).encode(charset)
+            if response.has_header('Content-Length'):
+                response['Content-Length'] = str(len(response.content))
+        return response
+
+
+def accepted_encodings(request):
+    encodings = set()
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        _, _, quality = params.partition('q=')
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+def uses_csrf_token(request, response):
+    return bool(request.META.get('CSRF_COOKIE_USED')) or (
+        settings.CSRF_COOKIE_NAME in response.cookies
+    )
+
+
+def choose_encoding(request, streaming=False):
+    encodings = accepted_encodings(request)
+    if brotli is not None and not streaming and 'br' in encodings:
+        return 'br'
+    if 'gzip' in encodings:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content)
+    return compress_string(content)
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.has_header('Content-Encoding')
+            or uses_csrf_token(request, response)
+            or (not response.streaming
+                and len(response.content) < settings.COMPRESS_MIN_SIZE)
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request, response.streaming)
+        if encoding is None:
+            return response
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+def serve_precompressed(request, path, document_root=None, **kwargs):
+    """Отдаёт заранее сжатый ``.br`` или ``.gz`` рядом со статикой."""
+    encodings = accepted_encodings(request)
+    for encoding, suffix in PRECOMPRESSED:
+        if encoding in encodings and os.path.isfile(
+                os.path.join(document_root, path + suffix)):
+            response = serve(request, path + suffix, document_root, **kwargs)
+            break
+    else:
+        response = serve(request, path, document_root, **kwargs)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def precompress(path, force=False):
+    """Пишет рядом с файлом ``.gz`` и ``.br``; возвращает размеры.
+
+    Файлы короче ``COMPRESS_MIN_SIZE`` пропускаются, неизменившиеся
+    без ``force`` не пересжимаются.
+    """
+    with open(path, 'rb') as source:
+        content = source.read()
+    if len(content) < settings.COMPRESS_MIN_SIZE:
+        return None
+    variants = [('.gz', lambda data: gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress))
+    smallest = len(content)
+    for suffix, compressor in variants:
+        target = path + suffix
+        if not force and os.path.exists(target) and (
+                os.path.getmtime(target) >= os.path.getmtime(path)):
+            smallest = min(smallest, os.path.getsize(target))
+            continue
+        data = compressor(content)
+        with open(target, 'wb') as output:
+            output.write(data)
+        smallest = min(smallest, len(data))
+    return len(content), smallest
@@ -0,0 +1,26 @@
+"""SQLite-бэкенд, настраивающий каждое новое соединение через PRAGMA.
+
+Транзакции начинаются с ``BEGIN IMMEDIATE``: отложенная транзакция,
+которая сначала читает, а потом пишет, при конкурирующем писателе
+получает ``database is locked`` сразу, не дожидаясь ``busy_timeout``.
+Немедленная берёт блокировку записи в начале и ждёт её как положено.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+def apply_pragmas(connection, pragmas):
+    cursor = connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    cursor.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, settings.SQLITE_PRAGMAS)
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
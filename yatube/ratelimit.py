@@ -0,0 +1,125 @@
+"""Ограничение частоты запросов к пишущим представлениям.
+
+Бюджеты задаются в ``RATE_LIMITS`` как пары «число запросов, период в
+секундах». Каждый запрос проверяется сразу по двум ключам: IP-адресу
+клиента и, если он вошёл, пользователю; бюджет IP для вошедших в
+``RATE_LIMIT_IP_FACTOR`` раз больше, чтобы не мешать соседям за одним
+NAT, но несколько аккаунтов с одного адреса его не обходят.
+
+Каждому ключу соответствует ведро жетонов в общем кэше
+``RATE_LIMIT_CACHE_ALIAS``: в нём помещается ``limit`` жетонов, и за
+период оно наполняется целиком. Запрос берёт по жетону из ведра каждого
+ключа под блокировкой, которую даёт атомарный ``cache.add``, поэтому
+лимит соблюдается для любого числа процессов, а база данных не
+участвует вовсе. Ведро хранится ровно период: к этому времени оно
+наполнилось бы, так что пропавший ключ и есть полное ведро. Отклонённый
+запрос жетонов не берёт, и клиент, который повторяет попытки, не
+продлевает себе блокировку. Превышение отвечает 429 до входа в
+представление.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+BUCKET_KEY = 'ratelimit:{}'
+LOCK_KEY = 'ratelimit:lock:{}'
+# Срок блокировки на случай, если процесс упал, не сняв её.
+LOCK_TIMEOUT = 1
+LOCK_POLL_SECONDS = 0.001
+
+
+def rate_limit_cache():
+    return caches[settings.RATE_LIMIT_CACHE_ALIAS]
+
+
+def client_keys(request, limit):
+    """Пары «ключ, лимит»: IP-адрес и пользователь, если он вошёл."""
+    ip_key = f'ip:{request.META.get("REMOTE_ADDR", "")}'
+    if not request.user.is_authenticated:
+        return [(ip_key, limit)]
+    return [
+        (f'user:{request.user.pk}', limit),
+        (ip_key, limit * settings.RATE_LIMIT_IP_FACTOR),
+    ]
+
+
+def unlock(cache, keys):
+    cache.delete_many([LOCK_KEY.format(key) for key in keys])
+
+
+def lock(cache, keys):
+    """Блокирует вёдра ``keys`` и возвращает их или ``None``, если не
+    дождался блокировки за ``RATE_LIMIT_LOCK_WAIT`` секунд.
+
+    Ключи блокируются по порядку, чтобы запросы не ждали друг друга
+    по кругу.
+    """
+    deadline = time.monotonic() + settings.RATE_LIMIT_LOCK_WAIT
+    locked = []
+    for key in sorted(set(keys)):
+        while not cache.add(LOCK_KEY.format(key), 1, LOCK_TIMEOUT):
+            if time.monotonic() > deadline:
+                unlock(cache, locked)
+                return None
+            time.sleep(LOCK_POLL_SECONDS)
+        locked.append(key)
+    return locked
+
+
+def hit(keys, period):
+    """Берёт по жетону из ведра каждого ключа или ни из одного.
+
+    ``keys`` — пары «ключ, лимит». Возвращает ``0``, если жетоны есть
+    во всех вёдрах, иначе — через сколько секунд повторить.
+    """
+    cache = rate_limit_cache()
+    locked = lock(cache, [key for key, _ in keys])
+    if locked is None:
+        return 1
+    try:
+        now = time.time()
+        buckets = cache.get_many([BUCKET_KEY.format(key) for key in locked])
+        taken = {}
+        for key, limit in keys:
+            name = BUCKET_KEY.format(key)
+            tokens, stamp = buckets.get(name, (limit, now))
+            tokens = min(limit, tokens + (now - stamp) * limit / period)
+            if tokens < 1:
+                return math.ceil((1 - tokens) * period / limit)
+            taken[name] = (tokens - 1, now)
+        cache.set_many(taken, period)
+    finally:
+        unlock(cache, locked)
+    return 0
+
+
+def rate_limit(scope, methods=None):
+    """Ограничивает запросы к представлению бюджетом ``scope``.
+
+    Если заданы ``methods``, учитываются только запросы этими методами.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            budget = settings.RATE_LIMITS.get(scope)
+            if budget and (methods is None or request.method in methods):
+                limit, period = budget
+                retry_after = hit([
+                    (f'{scope}:{key}', key_limit)
+                    for key, key_limit in client_keys(request, limit)
+                ], period)
+                if retry_after:
+                    response = HttpResponse(
+                        'Слишком много запросов, попробуйте позже.',
+                        content_type='text/plain; charset=utf-8',
+                        status=429,
+                    )
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
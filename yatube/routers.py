@@ -0,0 +1,84 @@
+"""Маршрутизация чтения на реплики с закреплением за основной БД.
+
+Представления, помеченные ``replica_reads``, читают из случайной реплики
+из ``REPLICA_DATABASES``. Сессии и пользователи всегда читаются из
+основной базы: отставание реплики сразу после входа выглядело бы как
+выход из аккаунта. После выполненной записи клиент получает cookie и на
+``REPLICA_STICKY_SECONDS`` читает только из основной базы, чтобы сразу
+увидеть свои изменения, пока реплика догоняет.
+"""
+import random
+import threading
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARY_COOKIE = 'use_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_APPS = ('sessions', 'auth')
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_state = threading.local()
+
+
+def replica_reads(view):
+    view.replica_reads = True
+    return view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.REPLICA_DATABASES
+        if (
+            replicas
+            and getattr(_state, 'use_replica', False)
+            and model._meta.app_label not in PRIMARY_APPS
+        ):
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+def track_writes(execute, sql, params, many, context):
+    """Отмечает запрос, выполнивший запись, а не только выбравший базу."""
+    if sql.lstrip().upper().startswith(WRITE_STATEMENTS):
+        _state.wrote = True
+    return execute(sql, params, many, context)
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.use_replica = False
+        _state.wrote = False
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(track_writes)
+                    )
+                response = self.get_response(request)
+        finally:
+            _state.use_replica = False
+        if _state.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PRIMARY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _state.use_replica = (
+            getattr(view_func, 'replica_reads', False)
+            and request.method in SAFE_METHODS
+            and PRIMARY_COOKIE not in request.COOKIES
+        )
@@ -25,10 +25,24 @@ SECRET_KEY = 'ph&ll9mx4zlm-3a$u(iw$tg6feu8v1nd)o#mb7%2e0m^0jllv4'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Кэш 'shared' общий для всех процессов сервера: в нём сессии и
+# пользователи сессий, сброс которых должен быть виден сразу везде.
+# По умолчанию файловый, общий для процессов одной машины; при
+# нескольких серверах задайте MEMCACHED_LOCATION.
+SHARED_CACHE_DIR = os.path.join(BASE_DIR, 'shared_cache')
+MEMCACHED_LOCATION = os.environ.get('MEMCACHED_LOCATION')
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': MEMCACHED_LOCATION,
+    } if MEMCACHED_LOCATION else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': SHARED_CACHE_DIR,
+    },
 }
 
 ALLOWED_HOSTS = [
@@ -43,8 +57,8 @@ ALLOWED_HOSTS = [
 
 INSTALLED_APPS = [
     'about',
-    'posts',
-    'users',
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -56,12 +70,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'yatube.compression.CompressionMiddleware',
+    'yatube.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'yatube.compression.MinifyHTMLMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -80,24 +97,56 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'posts.context_processors.get_year_footer',
+                'posts.context_processors.following',
             ],
         },
     },
 ]
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+]
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'shared'
+
+USER_CACHE_ALIAS = 'shared'
+USER_CACHE_TIMEOUT = 60 * 5
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Потоков, в которых ASGI-точка входа выполняет WSGI-приложение.
+ASGI_THREADS = 10
+
 
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'yatube.db',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
     }
 }
 
+DATABASE_ROUTERS = ['yatube.routers.ReplicaRouter']
+
+# Алиасы реплик из DATABASES, которые используют представления только для
+# чтения. Пустой список отправляет все запросы в основную базу.
+REPLICA_DATABASES = []
+
+REPLICA_STICKY_SECONDS = 5
+
+# WAL позволяет читать во время записи, а busy_timeout заставляет
+# конкурирующих писателей ждать блокировку вместо `database is locked`.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 64 * 1024 * 1024,
+    'cache_size': -20000,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -137,7 +186,9 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
-STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATICFILES_STORAGE = 'yatube.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -149,3 +200,90 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 POSTS_ON_PAGE = 10
+INDEX_CACHE_TIMEOUT = 10
+
+# Версии областей данных лент для ETag и Last-Modified: общий кэш и
+# срок хранения версии, после которого она начинается заново.
+FEED_VERSION_CACHE_ALIAS = 'shared'
+FEED_VERSION_TIMEOUT = 7 * 24 * 60 * 60
+COMMENTS_ON_PAGE = 20
+
+# Время жизни анонимных страниц лент на CDN и класс, очищающий кэш CDN
+# по surrogate-ключам при изменении постов, комментариев и групп.
+CDN_CACHE_SECONDS = 60
+CDN_PURGER = 'posts.cdn.NullPurger'
+
+# Как часто страница подписок спрашивает о новых постах авторов.
+FOLLOW_POLL_SECONDS = 30
+
+# Очередь фоновых задач в БД, обрабатывается командой runtasks.
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_DELAY = 10
+TASKS_LEASE_SECONDS = 5 * 60
+TASKS_KEEP_DONE_SECONDS = 24 * 60 * 60
+
+# Лента популярных постов: период полураспада веса события в секундах,
+# веса нового поста, комментария и подписки на автора, длина ленты.
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_POST_WEIGHT = 1.0
+TRENDING_COMMENT_WEIGHT = 2.0
+TRENDING_FOLLOW_WEIGHT = 1.0
+TRENDING_SIZE = 20
+# В таблице рейтинга остаются TRENDING_KEEP лучших постов с затухшим
+# весом не меньше TRENDING_MIN_WEIGHT.
+TRENDING_KEEP = 10 * TRENDING_SIZE
+TRENDING_MIN_WEIGHT = 0.01
+
+# Лимиты частоты пишущих запросов: число запросов за период в секундах
+# на пользователя и на IP-адрес; для вошедших пользователей лимит IP в
+# RATE_LIMIT_IP_FACTOR раз больше. profile_follow считает и отписки.
+RATE_LIMITS = {
+    'new_post': (20, 60 * 60),
+    'add_comment': (30, 60),
+    'profile_follow': (60, 60),
+    'signup': (10, 60 * 60),
+}
+RATE_LIMIT_IP_FACTOR = 3
+# Общий кэш вёдер жетонов и сколько секунд запрос ждёт блокировку ведра,
+# прежде чем получить 429.
+RATE_LIMIT_CACHE_ALIAS = 'shared'
+RATE_LIMIT_LOCK_WAIT = 0.5
+
+# Отсев почти одинаковых постов и комментариев: тексты короче
+# DUPLICATE_MIN_LENGTH не проверяются, похожими считаются отпечатки с
+# расстоянием Хэмминга не больше DUPLICATE_MAX_DISTANCE (не больше 3).
+DUPLICATE_MIN_LENGTH = 50
+DUPLICATE_MAX_DISTANCE = 3
+DUPLICATE_WINDOW_SECONDS = 7 * 24 * 60 * 60
+
+# Время жизни отрендеренных карточек постов в кэше.
+POST_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Размеры страниц лент; клиент может запросить свой через ?per_page=,
+# но не больше MAX_PAGE_SIZE. PREFETCH_NEXT_PAGE включает фоновый
+# прогрев карточек следующей страницы после ответа в пуле из
+# PREFETCH_WORKERS потоков с очередью не длиннее PREFETCH_QUEUE_SIZE.
+FEED_PAGE_SIZES = {
+    'index': POSTS_ON_PAGE,
+    'group': POSTS_ON_PAGE,
+    'profile': POSTS_ON_PAGE,
+    'follow': POSTS_ON_PAGE,
+    'api': POSTS_ON_PAGE,
+}
+MAX_PAGE_SIZE = 50
+PREFETCH_NEXT_PAGE = False
+PREFETCH_WORKERS = 2
+PREFETCH_QUEUE_SIZE = 20
+
+# Сжатие ответов не короче COMPRESS_MIN_SIZE байт (brotli — если
+# установлен пакет brotli) и схлопывание пробелов в HTML.
+COMPRESS_MIN_SIZE = 500
+MINIFY_HTML = True
+
+# Срок кэширования статики с хэшем содержимого в имени.
+STATIC_IMMUTABLE_SECONDS = 365 * 24 * 60 * 60
+
+# Общий кэш и срок хранения множества авторов, на которых подписан
+# пользователь; подписка и отписка сбрасывают кэш сразу.
+FOLLOWING_CACHE_ALIAS = 'shared'
+FOLLOWING_CACHE_TIMEOUT = 60 * 60
@@ -0,0 +1,60 @@
+"""Статика с хэшем содержимого в имени и долгим кэшированием.
+
+``collectstatic`` с ``CompressedManifestStaticFilesStorage`` копирует
+статику в ``STATIC_ROOT``, добавляет к именам хэш содержимого, пишет
+манифест и кладёт рядом с хэшированными файлами ``.gz`` и ``.br``.
+Хэшированное имя меняется вместе с содержимым, поэтому такие файлы
+отдаются с ``Cache-Control: immutable`` на ``STATIC_IMMUTABLE_SECONDS``.
+Пока статика не собрана, ``{% static %}`` отдаёт исходные имена.
+
+``serve_static`` работает только при DEBUG; в продакшене статику и
+заголовок ``immutable`` для хэшированных имён отдаёт фронтовой сервер
+(пример настройки nginx — в README).
+"""
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.http import Http404
+from django.utils.cache import patch_cache_control
+
+from .compression import COMPRESSIBLE, precompress, serve_precompressed
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(COMPRESSIBLE):
+                precompress(self.path(name))
+
+    def is_hashed(self, name):
+        return name in self.hashed_files.values()
+
+
+def serve_static(request, path, **kwargs):
+    """Статика для разработки: собранная или прямо из исходников."""
+    root = settings.STATIC_ROOT
+    if not os.path.isfile(os.path.join(root, path)):
+        found = finders.find(path)
+        if found is None:
+            raise Http404(path)
+        root = found[:-len(path)]
+    response = serve_precompressed(request, path, document_root=root)
+    if getattr(staticfiles_storage, 'is_hashed', None) and (
+            staticfiles_storage.is_hashed(path)):
+        patch_cache_control(response, public=True, immutable=True,
+                            max_age=settings.STATIC_IMMUTABLE_SECONDS)
+    return response
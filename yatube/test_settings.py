@@ -0,0 +1,25 @@
+"""Настройки тестов.
+
+Общий кэш ``shared`` в тестах живёт в памяти процесса: тесты очищают
+его и пишут ключи по id тестовой базы, и файловый кэш разработчика с
+его сессиями при этом трогать нельзя. Тесты идут в одном процессе,
+поэтому проверка ``users.E001`` здесь не нужна.
+
+Вёдра ограничителя частоты лежат в том же кэше и не откатываются вместе
+с транзакцией теста, поэтому лимиты выключены; ``test_ratelimit``
+задаёт свои.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import CACHES
+
+CACHES = {
+    **CACHES,
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    },
+}
+
+SILENCED_SYSTEM_CHECKS = ['users.E001']
+
+RATE_LIMITS = {}